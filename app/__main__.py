@@ -17,6 +17,9 @@ from app.bot.middlewares import MaintenanceMiddleware
 from app.bot.models import ServicesContainer
 from app.bot.payment_gateways import GatewayFactory
 from app.bot.utils import commands
+from app.bot.utils.deferred import DeferredActions
+from app.bot.utils.identity import BotIdentity
+from app.bot.utils.outbound import OutboundDispatcher
 from app.bot.utils.constants import (
     BOT_STARTED_TAG,
     BOT_STOPPED_TAG,
@@ -25,19 +28,33 @@ from app.bot.utils.constants import (
     TELEGRAM_WEBHOOK,
 )
 from app.config import DEFAULT_BOT_HOST, DEFAULT_LOCALES_DIR, Config, load_config
+from app.db.cache import UserCache
 from app.db.database import Database
 
 
-async def on_shutdown(db: Database, bot: Bot, services: ServicesContainer) -> None:
+async def on_shutdown(
+    db: Database,
+    bot: Bot,
+    services: ServicesContainer,
+    gateway_factory: GatewayFactory,
+) -> None:
     await services.notification.notify_developer(BOT_STOPPED_TAG)
+    await gateway_factory.close()
     await commands.delete(bot)
+    await DeferredActions.close()
     await bot.delete_webhook()
     await bot.session.close()
     await db.close()
     logging.info("Bot stopped.")
 
 
-async def on_startup(config: Config, bot: Bot, services: ServicesContainer, db: Database) -> None:
+async def on_startup(
+    config: Config,
+    bot: Bot,
+    services: ServicesContainer,
+    db: Database,
+    gateway_factory: GatewayFactory,
+) -> None:
     webhook_url = urljoin(config.bot.DOMAIN, TELEGRAM_WEBHOOK)
 
     if await bot.get_webhook_info() != webhook_url:
@@ -46,10 +63,15 @@ async def on_startup(config: Config, bot: Bot, services: ServicesContainer, db:
     current_webhook = await bot.get_webhook_info()
     logging.info(f"Current webhook URL: {current_webhook.url}")
 
+    await BotIdentity.refresh(bot)
+
     await services.notification.notify_developer(BOT_STARTED_TAG)
     logging.info("Bot started.")
 
     tasks.transactions.start_scheduler(db.session)
+    tasks.servers.start_scheduler(services.server_pool)
+    await services.broadcast.resume()
+    await gateway_factory.queue.start()
     if config.shop.REFERRER_REWARD_ENABLED:
         tasks.referral.start_scheduler(
             session_factory=db.session, referral_service=services.referral
@@ -74,11 +96,20 @@ async def main() -> None:
     storage = RedisStorage.from_url(url=config.redis.url())
     # storage = MemoryStorage()
 
+    # Set up user identity cache
+    UserCache.setup(
+        maxsize=config.cache.USER_SIZE,
+        ttl=config.cache.USER_TTL,
+        redis=storage.redis if config.cache.USER_REDIS_ENABLED else None,
+    )
+
     # Initialize the bot with the token and default properties
     bot = Bot(
         token=config.bot.TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML, link_preview_is_disabled=True),
     )
+    outbound = OutboundDispatcher()
+    bot.session.middleware(outbound)
 
     # Set up internationalization (i18n)
     i18n = I18n(path=DEFAULT_LOCALES_DIR, default_locale=DEFAULT_LANGUAGE, domain=I18N_DOMAIN)
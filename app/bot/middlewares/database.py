@@ -28,21 +28,23 @@ class DBSessionMiddleware(BaseMiddleware):
             tg_user: TelegramUser | None = event.event.from_user
 
             if tg_user is not None and not tg_user.is_bot:
-                user = await User.get(session=session, tg_id=tg_user.id)
-                is_new_user = False
-
-                if not user:
-                    is_new_user = True
-                    user = await User.create(
-                        session=session,
-                        tg_id=tg_user.id,
-                        vpn_id=str(uuid.uuid4()),
-                        first_name=tg_user.first_name,
-                        username=tg_user.username,
-                        language_code=tg_user.language_code,
-                    )
+                user, is_new_user = await User.get_or_create(
+                    session=session,
+                    tg_id=tg_user.id,
+                    vpn_id=str(uuid.uuid4()),
+                    first_name=tg_user.first_name,
+                    username=tg_user.username,
+                    language_code=tg_user.language_code,
+                )
+
+                if is_new_user:
                     logger.info(f"New user {user.tg_id} created.")
 
+                if user and user.blocked_at is not None:
+                    await User.update(session=session, tg_id=user.tg_id, blocked_at=None)
+                    user.blocked_at = None
+                    logger.info(f"User {user.tg_id} is reachable again.")
+
                 data["user"] = user
                 data["session"] = session
                 data["is_new_user"] = is_new_user
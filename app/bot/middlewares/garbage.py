@@ -5,6 +5,8 @@ from typing import Any, Awaitable, Callable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Update
 
+from app.bot.utils.constants import GARBAGE_DELETE_DELAY
+from app.bot.utils.deferred import DeferredActions
 from app.bot.utils.navigation import NavMain
 
 logger = logging.getLogger(__name__)
@@ -30,10 +32,12 @@ class GarbageMiddleware(BaseMiddleware):
                 and not event.message.text.endswith(NavMain.START)
                 or event.message.forward_from
             ):
-                try:
-                    await event.message.delete()
-                    logger.debug(f"Message {event.message.text} from user {user_id} deleted.")
-                except Exception as exception:
-                    logger.error(f"Failed to delete message from user {user_id}: {exception}")
+                DeferredActions.delete(
+                    bot=event.bot,
+                    chat_id=event.message.chat.id,
+                    message_id=event.message.message_id,
+                    delay=GARBAGE_DELETE_DELAY,
+                )
+                logger.debug(f"Message {event.message.message_id} from user {user_id} queued.")
 
         return await handler(event, data)
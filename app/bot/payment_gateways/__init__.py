@@ -1,4 +1,6 @@
 from ._gateway import PaymentGateway
+from ._http import HttpClient
+from ._queue import PaymentQueue
 from .cryptomus import Cryptomus
 from .gateway_factory import GatewayFactory
 from .heleket import Heleket
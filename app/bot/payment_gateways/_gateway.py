@@ -1,5 +1,7 @@
+import json
 import logging
 from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable
 
 from aiogram import Bot
 from aiogram.fsm.storage.redis import RedisStorage
@@ -16,12 +18,25 @@ from app.bot.utils.constants import (
     EVENT_PAYMENT_CANCELED_TAG,
     EVENT_PAYMENT_SUCCEEDED_TAG,
     Currency,
+    PAYMENT_EFFECT_KEY,
+    PAYMENT_EFFECT_TTL,
+    PAYMENT_HTTP_RETRIES,
+    PAYMENT_HTTP_TIMEOUT,
+    PAYMENT_LINK_KEY,
+    PAYMENT_LINK_TTL,
+    PAYMENT_PROCESSING_LEASE,
+    OutboundPriority,
+    PaymentEvent,
     TransactionStatus,
 )
 from app.bot.utils.formatting import format_device_count, format_subscription_period
+from app.bot.utils.outbound import outbound_priority
 from app.config import Config
 from app.db.models import Transaction, User
 
+from ._http import HttpClient, HttpResponse
+from ._queue import PaymentQueue
+
 logger = logging.getLogger(__name__)
 
 from app.bot.models import SubscriptionData
@@ -32,6 +47,8 @@ class PaymentGateway(ABC):
     name: str
     currency: Currency
     callback: str
+    http_timeout: float = PAYMENT_HTTP_TIMEOUT
+    http_retries: int = PAYMENT_HTTP_RETRIES
 
     def __init__(
         self,
@@ -42,6 +59,7 @@ class PaymentGateway(ABC):
         bot: Bot,
         i18n: I18n,
         services: ServicesContainer,
+        http: HttpClient,
     ) -> None:
         self.app = app
         self.config = config
@@ -50,6 +68,7 @@ class PaymentGateway(ABC):
         self.bot = bot
         self.i18n = i18n
         self.services = services
+        self.http = http
 
     @abstractmethod
     async def create_payment(self, data: SubscriptionData) -> str:
@@ -63,39 +82,204 @@ class PaymentGateway(ABC):
     async def handle_payment_canceled(self, payment_id: str) -> None:
         pass
 
+    async def close(self) -> None:
+        pass
+
+    async def _post(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.http.post(
+            url,
+            timeout=self.http_timeout,
+            retries=self.http_retries,
+            **kwargs,
+        )
+
+    def transaction_fields(self, data: SubscriptionData) -> dict[str, Any]:
+        return {
+            "tg_id": data.user_id,
+            "subscription": data.pack(),
+            "gateway": self.callback.value,
+            "currency": self.currency.code,
+            "price": data.price,
+            "devices": data.devices,
+            "duration": data.duration,
+        }
+
+    async def get_payment_link(self, data: SubscriptionData) -> str:
+        """
+        Returns a payment link for the checkout, reusing a recent one.
+
+        A link created for the same user, gateway, devices, duration and price
+        is reused while its transaction is still pending, so repeated taps on
+        "pay" do not create new gateway payments.
+        """
+        key = PAYMENT_LINK_KEY + data.pack()
+
+        try:
+            cached = await self.storage.redis.get(key)
+        except Exception as exception:
+            logger.error(f"Failed to read payment link from Redis: {exception}")
+            cached = None
+
+        if cached:
+            link = json.loads(cached)
+            payment_id = link.get("payment_id")
+
+            if payment_id is None:
+                return link["url"]
+
+            async with self.session() as session:
+                transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
+
+            if transaction and transaction.status == TransactionStatus.PENDING:
+                logger.info(f"Payment link reused for user {data.user_id}: {payment_id}")
+                return link["url"]
+
+        return await self.create_payment(data)
+
+    async def _remember_link(
+        self,
+        data: SubscriptionData,
+        pay_url: str,
+        payment_id: str | None = None,
+    ) -> None:
+        link = json.dumps({"url": pay_url, "payment_id": payment_id})
+
+        try:
+            await self.storage.redis.set(PAYMENT_LINK_KEY + data.pack(), link, ex=PAYMENT_LINK_TTL)
+        except Exception as exception:
+            logger.error(f"Failed to store payment link in Redis: {exception}")
+
+    async def enqueue_payment(self, event: PaymentEvent, payment_id: str) -> None:
+        # Push before marking the transaction paid: if Redis is down the row stays
+        # pending and the gateway redelivers the webhook, while a queued job can
+        # always claim a pending row.
+        await PaymentQueue.push(
+            redis=self.storage.redis,
+            gateway=self.callback,
+            event=event,
+            payment_id=payment_id,
+        )
+
+        if event == PaymentEvent.SUCCEEDED:
+            async with self.session() as session:
+                await Transaction.transition(
+                    session=session,
+                    payment_id=payment_id,
+                    from_status=TransactionStatus.PENDING,
+                    to_status=TransactionStatus.PROCESSING,
+                )
+
     async def _on_payment_succeeded(self, payment_id: str) -> None:
+        """
+        Grants a paid subscription and runs the payment side effects.
+
+        The transaction is claimed with a processing lease and marked completed
+        only after the 3X-UI change succeeded; a failed attempt releases the
+        lease for the next retry. Side effects run after completion, each at
+        most once per payment, so retries only finish the ones still missing.
+        """
         logger.info(f"Payment succeeded {payment_id}")
+        outbound_priority.set(OutboundPriority.PAYMENT)
 
         async with self.session() as session:
-            transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
+            transaction = await Transaction.claim(
+                session=session,
+                payment_id=payment_id,
+                lease=PAYMENT_PROCESSING_LEASE,
+            )
+
+            if not transaction:
+                transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
+
+                if transaction and transaction.status == TransactionStatus.PROCESSING:
+                    raise RuntimeError(f"Payment {payment_id} is processed by another worker")
+
+                if not transaction or transaction.status != TransactionStatus.COMPLETED:
+                    logger.info(f"Payment {payment_id} is not payable, skipped.")
+                    return
+
             data = SubscriptionData.unpack(transaction.subscription)
             logger.debug(f"Subscription data unpacked: {data}")
             user = await User.get(session=session, tg_id=data.user_id)
 
-            await Transaction.update(
-                session=session,
-                payment_id=payment_id,
-                status=TransactionStatus.COMPLETED,
+        if transaction.status == TransactionStatus.PROCESSING:
+            try:
+                await self._apply_subscription(data=data, user=user)
+            except BaseException:
+                async with self.session() as session:
+                    await Transaction.release(session=session, payment_id=payment_id)
+                raise
+
+            async with self.session() as session:
+                await Transaction.transition(
+                    session=session,
+                    payment_id=payment_id,
+                    from_status=TransactionStatus.PROCESSING,
+                    to_status=TransactionStatus.COMPLETED,
+                    processing_at=None,
+                )
+
+        await self._run_side_effects(payment_id=payment_id, data=data, user=user)
+
+    async def _apply_subscription(self, data: SubscriptionData, user: User) -> None:
+        if data.is_extend:
+            extended = await self.services.vpn.extend_subscription(
+                user=user,
+                devices=data.devices,
+                duration=data.duration,
+            )
+            if not extended:
+                raise RuntimeError(f"Failed to extend subscription for user {user.tg_id}")
+            logger.info(f"Subscription extended for user {user.tg_id}")
+        elif data.is_change:
+            changed = await self.services.vpn.change_subscription(
+                user=user,
+                devices=data.devices,
+                duration=data.duration,
             )
+            if not changed:
+                raise RuntimeError(f"Failed to change subscription for user {user.tg_id}")
+            logger.info(f"Subscription changed for user {user.tg_id}")
+        else:
+            created = await self.services.vpn.create_subscription(
+                user=user,
+                devices=data.devices,
+                duration=data.duration,
+            )
+            if not created:
+                raise RuntimeError(f"Failed to create subscription for user {user.tg_id}")
+            logger.info(f"Subscription created for user {user.tg_id}")
 
+    async def _run_side_effects(self, payment_id: str, data: SubscriptionData, user: User) -> None:
         if self.config.shop.REFERRER_REWARD_ENABLED:
-            await self.services.referral.add_referrers_rewards_on_payment(
-                referred_tg_id=data.user_id,
-                payment_amount=data.price,  # TODO: (!) add currency unified processing
-                payment_id=payment_id,
+            await self._once(
+                payment_id,
+                "referral",
+                lambda: self.services.referral.add_referrers_rewards_on_payment(
+                    referred_tg_id=data.user_id,
+                    payment_amount=data.price,  # TODO: (!) add currency unified processing
+                    payment_id=payment_id,
+                ),
             )
 
-        await self.services.notification.notify_developer(
-            text=EVENT_PAYMENT_SUCCEEDED_TAG
-            + "\n\n"
-            + _("payment:event:payment_succeeded").format(
-                payment_id=payment_id,
-                user_id=user.tg_id,
-                devices=format_device_count(data.devices),
-                duration=format_subscription_period(data.duration),
+        await self._once(
+            payment_id,
+            "notify_developer",
+            lambda: self.services.notification.notify_developer(
+                text=EVENT_PAYMENT_SUCCEEDED_TAG
+                + "\n\n"
+                + _("payment:event:payment_succeeded").format(
+                    payment_id=payment_id,
+                    user_id=user.tg_id,
+                    devices=format_device_count(data.devices),
+                    duration=format_subscription_period(data.duration),
+                ),
             ),
         )
 
+        await self._once(payment_id, "notify_user", lambda: self._notify_user(data=data, user=user))
+
+    async def _notify_user(self, data: SubscriptionData, user: User) -> None:
         locale = user.language_code if user else DEFAULT_LANGUAGE
         with self.i18n.use_locale(locale):
             await redirect_to_main_menu(
@@ -107,52 +291,56 @@ class PaymentGateway(ABC):
             )
 
             if data.is_extend:
-                await self.services.vpn.extend_subscription(
-                    user=user,
-                    devices=data.devices,
-                    duration=data.duration,
-                )
-                logger.info(f"Subscription extended for user {user.tg_id}")
                 await self.services.notification.notify_extend_success(
                     user_id=user.tg_id,
                     data=data,
                 )
             elif data.is_change:
-                await self.services.vpn.change_subscription(
-                    user=user,
-                    devices=data.devices,
-                    duration=data.duration,
-                )
-                logger.info(f"Subscription changed for user {user.tg_id}")
                 await self.services.notification.notify_change_success(
                     user_id=user.tg_id,
                     data=data,
                 )
             else:
-                await self.services.vpn.create_subscription(
-                    user=user,
-                    devices=data.devices,
-                    duration=data.duration,
-                )
-                logger.info(f"Subscription created for user {user.tg_id}")
                 key = await self.services.vpn.get_key(user)
                 await self.services.notification.notify_purchase_success(
                     user_id=user.tg_id,
                     key=key,
                 )
 
+    async def _once(
+        self,
+        payment_id: str,
+        effect: str,
+        action: Callable[[], Awaitable[Any]],
+    ) -> None:
+        key = PAYMENT_EFFECT_KEY + f"{payment_id}:{effect}"
+
+        if not await self.storage.redis.set(key, 1, nx=True, ex=PAYMENT_EFFECT_TTL):
+            logger.info(f"Payment {payment_id} {effect} already done, skipped.")
+            return
+
+        try:
+            await action()
+        except Exception:
+            await self.storage.redis.delete(key)
+            raise
+
     async def _on_payment_canceled(self, payment_id: str) -> None:
         logger.info(f"Payment canceled {payment_id}")
+        outbound_priority.set(OutboundPriority.PAYMENT)
         async with self.session() as session:
-            transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
-            data = SubscriptionData.unpack(transaction.subscription)
-
-            await Transaction.update(
+            transaction = await Transaction.transition(
                 session=session,
                 payment_id=payment_id,
-                status=TransactionStatus.CANCELED,
+                from_status=TransactionStatus.PENDING,
+                to_status=TransactionStatus.CANCELED,
             )
 
+            if not transaction:
+                return
+
+            data = SubscriptionData.unpack(transaction.subscription)
+
         await self.services.notification.notify_developer(
             text=EVENT_PAYMENT_CANCELED_TAG
             + "\n\n"
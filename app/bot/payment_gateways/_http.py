@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from app.bot.utils.constants import (
+    PAYMENT_HTTP_DNS_TTL,
+    PAYMENT_HTTP_POOL_SIZE,
+    PAYMENT_HTTP_RETRIES,
+    PAYMENT_HTTP_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    url: URL
+    data: Any
+
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by the payment gateways.
+
+    One aiohttp session with a keep-alive connection pool and DNS cache is
+    created on first use and closed on shutdown. Requests that could not
+    connect to the gateway are retried with backoff. A 502-504 answer is
+    retried only for idempotent methods: a proxy error on a POST may hide an
+    invoice the gateway already created. Timed out requests are not retried
+    for the same reason.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = PAYMENT_HTTP_POOL_SIZE,
+        dns_ttl: int = PAYMENT_HTTP_DNS_TTL,
+    ) -> None:
+        self.pool_size = pool_size
+        self.dns_ttl = dns_ttl
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=self.dns_ttl)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float = PAYMENT_HTTP_TIMEOUT,
+        retries: int = PAYMENT_HTTP_RETRIES,
+        **kwargs: Any,
+    ) -> HttpResponse:
+        retry_status = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(retries + 1):
+            try:
+                async with self.session.request(
+                    method,
+                    url,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                    **kwargs,
+                ) as response:
+                    if (
+                        not retry_status
+                        or response.status not in RETRY_STATUSES
+                        or attempt == retries
+                    ):
+                        data = (
+                            await response.json()
+                            if response.content_type == "application/json"
+                            else None
+                        )
+                        return HttpResponse(status=response.status, url=response.url, data=data)
+
+                    logger.warning(f"{method} {url} answered {response.status}, retrying.")
+            except aiohttp.ClientConnectorError as exception:
+                if attempt == retries:
+                    raise
+                logger.warning(f"{method} {url} failed: {exception!r}, retrying.")
+
+            await asyncio.sleep(2**attempt)
+
+    async def post(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("Payment gateways HTTP client closed.")
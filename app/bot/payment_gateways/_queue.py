@@ -0,0 +1,177 @@
+import asyncio
+import contextvars
+import logging
+import socket
+from typing import TYPE_CHECKING
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.bot.utils.constants import (
+    PAYMENT_QUEUE_DEAD_MAXLEN,
+    PAYMENT_QUEUE_DEAD_STREAM,
+    PAYMENT_QUEUE_DONE_TTL,
+    PAYMENT_QUEUE_GROUP,
+    PAYMENT_QUEUE_MAX_ATTEMPTS,
+    PAYMENT_QUEUE_RETRY_DELAY,
+    PAYMENT_QUEUE_STREAM,
+    PAYMENT_QUEUE_WORKERS,
+    OutboundPriority,
+    PaymentEvent,
+)
+from app.bot.utils.outbound import outbound_priority
+
+if TYPE_CHECKING:
+    from .gateway_factory import GatewayFactory
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentQueue:
+    """
+    Durable queue of verified payment webhooks backed by a Redis stream.
+
+    Webhook handlers only verify the request and `push` a job, so the gateway
+    gets its answer immediately. Workers of a consumer group run the gateway
+    handlers. A job is acknowledged after it succeeds; a failed job stays
+    pending and is claimed again after `PAYMENT_QUEUE_RETRY_DELAY`, until
+    `PAYMENT_QUEUE_MAX_ATTEMPTS` deliveries move it to the dead-letter stream.
+    Processed jobs are remembered, so repeated webhooks for the same payment
+    event are skipped. Workers run in their own context and send in the
+    payment lane, whatever lane the caller of `start` was in.
+    """
+
+    def __init__(self, redis: Redis, gateway_factory: "GatewayFactory") -> None:
+        self.redis = redis
+        self.gateway_factory = gateway_factory
+        self.consumer = f"{socket.gethostname()}-{id(self)}"
+        self._workers: list[asyncio.Task] = []
+
+    @staticmethod
+    async def push(redis: Redis, gateway: str, event: PaymentEvent, payment_id: str) -> None:
+        fields = {"gateway": gateway, "event": event.value, "payment_id": payment_id}
+        await redis.xadd(PAYMENT_QUEUE_STREAM, fields)
+        logger.info(f"Payment {payment_id} {event.value} queued for {gateway}.")
+
+    async def start(self, workers: int = PAYMENT_QUEUE_WORKERS) -> None:
+        try:
+            await self.redis.xgroup_create(
+                PAYMENT_QUEUE_STREAM,
+                PAYMENT_QUEUE_GROUP,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as exception:
+            if "BUSYGROUP" not in str(exception):
+                raise
+
+        self._workers = [
+            asyncio.create_task(
+                self._work(f"{self.consumer}-{index}"),
+                context=contextvars.Context(),
+            )
+            for index in range(workers)
+        ]
+        logger.info(f"Payment queue started with {workers} workers.")
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        logger.info("Payment queue stopped.")
+
+    async def _work(self, consumer: str) -> None:
+        outbound_priority.set(OutboundPriority.PAYMENT)
+
+        while True:
+            try:
+                await self._reclaim(consumer)
+                response = await self.redis.xreadgroup(
+                    PAYMENT_QUEUE_GROUP,
+                    consumer,
+                    {PAYMENT_QUEUE_STREAM: ">"},
+                    count=1,
+                    block=PAYMENT_QUEUE_RETRY_DELAY * 1000,
+                )
+                for _, messages in response or []:
+                    for message_id, fields in messages:
+                        await self._process(message_id, fields)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logger.error(f"Payment worker {consumer} failed: {exception}")
+                await asyncio.sleep(PAYMENT_QUEUE_RETRY_DELAY)
+
+    async def _reclaim(self, consumer: str) -> None:
+        idle = PAYMENT_QUEUE_RETRY_DELAY * 1000
+        pending = await self.redis.xpending_range(
+            PAYMENT_QUEUE_STREAM,
+            PAYMENT_QUEUE_GROUP,
+            min="-",
+            max="+",
+            count=1,
+            idle=idle,
+        )
+
+        for entry in pending:
+            claimed = await self.redis.xclaim(
+                PAYMENT_QUEUE_STREAM,
+                PAYMENT_QUEUE_GROUP,
+                consumer,
+                min_idle_time=idle,
+                message_ids=[entry["message_id"]],
+            )
+
+            for message_id, fields in claimed:
+                if entry["times_delivered"] >= PAYMENT_QUEUE_MAX_ATTEMPTS:
+                    await self._dead_letter(message_id, fields)
+                else:
+                    await self._process(message_id, fields)
+
+    async def _process(self, message_id: bytes, fields: dict) -> None:
+        job = {self._decode(key): self._decode(value) for key, value in fields.items()}
+        done_key = ":".join(
+            [PAYMENT_QUEUE_STREAM, "done", job["gateway"], job["event"], job["payment_id"]]
+        )
+
+        if await self.redis.exists(done_key):
+            logger.info(f"Payment {job['payment_id']} {job['event']} already processed.")
+            await self._ack(message_id)
+            return
+
+        try:
+            gateway = self.gateway_factory.get_gateway(job["gateway"])
+
+            if PaymentEvent(job["event"]) == PaymentEvent.SUCCEEDED:
+                await gateway.handle_payment_succeeded(job["payment_id"])
+            else:
+                await gateway.handle_payment_canceled(job["payment_id"])
+        except Exception as exception:
+            logger.exception(f"Payment job {self._decode(message_id)} failed: {exception}")
+            return
+
+        await self.redis.set(done_key, 1, ex=PAYMENT_QUEUE_DONE_TTL)
+        await self._ack(message_id)
+
+    async def _ack(self, message_id: bytes) -> None:
+        await self.redis.xack(PAYMENT_QUEUE_STREAM, PAYMENT_QUEUE_GROUP, message_id)
+        await self.redis.xdel(PAYMENT_QUEUE_STREAM, message_id)
+
+    async def _dead_letter(self, message_id: bytes, fields: dict) -> None:
+        await self.redis.xadd(
+            PAYMENT_QUEUE_DEAD_STREAM,
+            fields,
+            maxlen=PAYMENT_QUEUE_DEAD_MAXLEN,
+            approximate=True,
+        )
+        await self._ack(message_id)
+        logger.critical(
+            f"Payment job {self._decode(message_id)} moved to {PAYMENT_QUEUE_DEAD_STREAM} "
+            f"after {PAYMENT_QUEUE_MAX_ATTEMPTS} attempts: {fields}"
+        )
+
+    @staticmethod
+    def _decode(value: bytes | str) -> str:
+        return value.decode() if isinstance(value, bytes) else value
@@ -5,7 +5,6 @@ import logging
 import uuid
 from hmac import compare_digest
 
-import aiohttp
 from aiogram import Bot
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.utils.i18n import I18n
@@ -15,8 +14,14 @@ from aiohttp.web import Application, Request, Response
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.bot.models import ServicesContainer, SubscriptionData
-from app.bot.payment_gateways import PaymentGateway
-from app.bot.utils.constants import CRYPTOMUS_WEBHOOK, Currency, TransactionStatus
+from app.bot.payment_gateways import HttpClient, PaymentGateway
+from app.bot.utils.constants import (
+    CRYPTOMUS_WEBHOOK,
+    Currency,
+    PaymentEvent,
+    TransactionStatus,
+)
+from app.bot.utils.identity import BotIdentity
 from app.bot.utils.navigation import NavSubscription
 from app.config import Config
 from app.db.models import Transaction
@@ -28,6 +33,8 @@ class Cryptomus(PaymentGateway):
     name = ""
     currency = Currency.USD
     callback = NavSubscription.PAY_CRYPTOMUS
+    http_timeout = 30
+    http_retries = 1
 
     def __init__(
         self,
@@ -38,6 +45,7 @@ class Cryptomus(PaymentGateway):
         bot: Bot,
         i18n: I18n,
         services: ServicesContainer,
+        http: HttpClient,
     ) -> None:
         self.name = __("payment:gateway:cryptomus")
         self.app = app
@@ -47,13 +55,13 @@ class Cryptomus(PaymentGateway):
         self.bot = bot
         self.i18n = i18n
         self.services = services
+        self.http = http
 
         self.app.router.add_post(CRYPTOMUS_WEBHOOK, self.webhook_handler)
         logger.info("Cryptomus payment gateway initialized.")
 
     async def create_payment(self, data: SubscriptionData) -> str:
-        bot_username = (await self.bot.get_me()).username
-        redirect_url = f"https://t.me/{bot_username}"
+        redirect_url = await BotIdentity.link(self.bot)
         order_id = str(uuid.uuid4())
         price = str(data.price)
 
@@ -73,24 +81,25 @@ class Cryptomus(PaymentGateway):
             "Content-Type": "application/json",
         }
 
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.cryptomus.com/v1/payment"
-            async with session.post(url, json=payload, headers=headers) as response:
-                result = await response.json()
-                if response.status == 200 and result.get("result", {}).get("url"):
-                    pay_url = result["result"]["url"]
-                else:
-                    raise Exception(f"Error: {response.status}; Result: {result}; Data: {data}")
+        url = "https://api.cryptomus.com/v1/payment"
+        response = await self._post(url, json=payload, headers=headers)
+        result = response.data or {}
+        if response.status == 200 and result.get("result", {}).get("url"):
+            pay_url = result["result"]["url"]
+        else:
+            raise Exception(f"Error: {response.status}; Result: {result}; Data: {data}")
+
+        payment_id = result["result"]["order_id"]
 
         async with self.session() as session:
             await Transaction.create(
                 session=session,
-                tg_id=data.user_id,
-                subscription=data.pack(),
-                payment_id=result["result"]["order_id"],
+                payment_id=payment_id,
                 status=TransactionStatus.PENDING,
+                **self.transaction_fields(data),
             )
 
+        await self._remember_link(data=data, pay_url=pay_url, payment_id=payment_id)
         logger.info(f"Payment link created for user {data.user_id}: {pay_url}")
         return pay_url
 
@@ -111,12 +120,12 @@ class Cryptomus(PaymentGateway):
             match event_json.get("status"):
                 case "paid" | "paid_over":
                     order_id = event_json.get("order_id")
-                    await self.handle_payment_succeeded(order_id)
+                    await self.enqueue_payment(PaymentEvent.SUCCEEDED, order_id)
                     return Response(status=200)
 
                 case "cancel":
                     order_id = event_json.get("order_id")
-                    await self.handle_payment_canceled(order_id)
+                    await self.enqueue_payment(PaymentEvent.CANCELED, order_id)
                     return Response(status=200)
 
                 case _:
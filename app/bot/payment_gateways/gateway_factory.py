@@ -8,6 +8,8 @@ from app.bot.models import ServicesContainer
 from app.config import Config
 
 from ._gateway import PaymentGateway
+from ._http import HttpClient
+from ._queue import PaymentQueue
 from .cryptomus import Cryptomus
 from .heleket import Heleket
 from .telegram_stars import TelegramStars
@@ -18,6 +20,8 @@ from .yoomoney import Yoomoney
 class GatewayFactory:
     def __init__(self) -> None:
         self._gateways: dict[str, PaymentGateway] = {}
+        self.queue: PaymentQueue | None = None
+        self.http = HttpClient()
 
     def register_gateway(self, gateway: PaymentGateway) -> None:
         self._gateways[gateway.callback] = gateway
@@ -31,6 +35,15 @@ class GatewayFactory:
     def get_gateways(self) -> list[PaymentGateway]:
         return list(self._gateways.values())
 
+    async def close(self) -> None:
+        if self.queue:
+            await self.queue.close()
+
+        for gateway in self._gateways.values():
+            await gateway.close()
+
+        await self.http.close()
+
     def register_gateways(
         self,
         app: Application,
@@ -41,7 +54,8 @@ class GatewayFactory:
         i18n: I18n,
         services: ServicesContainer,
     ) -> None:
-        dependencies = [app, config, session, storage, bot, i18n, services]
+        dependencies = [app, config, session, storage, bot, i18n, services, self.http]
+        self.queue = PaymentQueue(redis=storage.redis, gateway_factory=self)
 
         gateways = [
             (config.shop.PAYMENT_STARS_ENABLED, TelegramStars),
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.bot.filters.is_dev import IsDev
 from app.bot.models import ServicesContainer, SubscriptionData
-from app.bot.payment_gateways import PaymentGateway
+from app.bot.payment_gateways import HttpClient, PaymentGateway
 from app.bot.utils.constants import Currency
 from app.bot.utils.formatting import format_device_count, format_subscription_period
 from app.bot.utils.navigation import NavSubscription
@@ -34,6 +34,7 @@ class TelegramStars(PaymentGateway):
         bot: Bot,
         i18n: I18n,
         services: ServicesContainer,
+        http: HttpClient,
     ) -> None:
         self.name = __("payment:gateway:telegram_stars")
         self.app = app
@@ -42,6 +43,7 @@ class TelegramStars(PaymentGateway):
         self.storage = storage
         self.bot = bot
         self.services = services
+        self.http = http
         self.i18n = i18n
         logger.info("TelegramStars payment gateway initialized.")
 
@@ -63,6 +65,7 @@ class TelegramStars(PaymentGateway):
             payload=data.pack(),
             currency=self.currency.code,
         )
+        await self._remember_link(data=data, pay_url=pay_url)
         logger.info(f"Payment link created for user {data.user_id}: {pay_url}")
         return pay_url
 
@@ -1,4 +1,8 @@
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 
 from aiogram import Bot
 from aiogram.fsm.storage.redis import RedisStorage
@@ -18,9 +22,17 @@ from yookassa.domain.notification import (
 from yookassa.domain.request.payment_request import PaymentRequest
 
 from app.bot.models import ServicesContainer, SubscriptionData
-from app.bot.payment_gateways import PaymentGateway
-from app.bot.utils.constants import YOOKASSA_WEBHOOK, Currency, TransactionStatus
+from app.bot.payment_gateways import HttpClient, PaymentGateway
+from app.bot.utils.constants import (
+    YOOKASSA_MAX_WORKERS,
+    YOOKASSA_WEBHOOK,
+    Currency,
+    PaymentEvent,
+    TransactionStatus,
+)
 from app.bot.utils.formatting import format_device_count, format_subscription_period
+from app.bot.utils.identity import BotIdentity
+from app.bot.utils.metrics import LatencyMetrics
 from app.bot.utils.navigation import NavSubscription
 from app.config import Config
 from app.db.models import Transaction
@@ -42,6 +54,7 @@ class Yookassa(PaymentGateway):
         bot: Bot,
         i18n: I18n,
         services: ServicesContainer,
+        http: HttpClient,
     ) -> None:
         self.name = __("payment:gateway:yookassa")
         self.app = app
@@ -51,14 +64,19 @@ class Yookassa(PaymentGateway):
         self.bot = bot
         self.i18n = i18n
         self.services = services
+        self.http = http
+        self.executor = ThreadPoolExecutor(
+            max_workers=YOOKASSA_MAX_WORKERS,
+            thread_name_prefix="yookassa",
+        )
+        self.metrics = LatencyMetrics(name="YooKassa API")
 
         Configuration.configure(self.config.yookassa.SHOP_ID, self.config.yookassa.TOKEN)
         self.app.router.add_post(YOOKASSA_WEBHOOK, self.webhook_handler)
         logger.info("YooKassa payment gateway initialized.")
 
     async def create_payment(self, data: SubscriptionData) -> str:
-        bot_username = (await self.bot.get_me()).username
-        redirect_url = f"https://t.me/{bot_username}"
+        redirect_url = await BotIdentity.link(self.bot)
 
         description = _("payment:invoice:description").format(
             devices=format_device_count(data.devices),
@@ -88,21 +106,38 @@ class Yookassa(PaymentGateway):
             receipt=receipt,
         )
 
-        response = Payment.create(request)
+        response = await self._call(Payment.create, request)
 
         async with self.session() as session:
             await Transaction.create(
                 session=session,
-                tg_id=data.user_id,
-                subscription=data.pack(),
                 payment_id=response.id,
                 status=TransactionStatus.PENDING,
+                **self.transaction_fields(data),
             )
 
         pay_url = response.confirmation["confirmation_url"]
+        await self._remember_link(data=data, pay_url=pay_url, payment_id=response.id)
         logger.info(f"Payment link created for user {data.user_id}: {pay_url}")
         return pay_url
 
+    async def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.metrics.log()
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs a blocking SDK call in the gateway thread pool and records its latency."""
+        started_at = time.monotonic()
+        failed = False
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.metrics.observe(time.monotonic() - started_at, failed=failed)
+
     async def handle_payment_succeeded(self, payment_id: str) -> None:
         await self._on_payment_succeeded(payment_id)
 
@@ -123,11 +158,11 @@ class Yookassa(PaymentGateway):
 
             match notification_object.event:
                 case WebhookNotificationEventType.PAYMENT_SUCCEEDED:
-                    await self.handle_payment_succeeded(payment_id)
+                    await self.enqueue_payment(PaymentEvent.SUCCEEDED, payment_id)
                     return Response(status=200)
 
                 case WebhookNotificationEventType.PAYMENT_CANCELED:
-                    await self.handle_payment_canceled(payment_id)
+                    await self.enqueue_payment(PaymentEvent.CANCELED, payment_id)
                     return Response(status=200)
 
                 case _:
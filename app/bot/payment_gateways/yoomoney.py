@@ -2,7 +2,6 @@ import hashlib
 import logging
 import uuid
 
-import requests
 from aiogram import Bot
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.utils.i18n import I18n
@@ -12,9 +11,15 @@ from aiohttp.web import Application, Request, Response
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.bot.models import ServicesContainer, SubscriptionData
-from app.bot.payment_gateways import PaymentGateway
-from app.bot.utils.constants import YOOMONEY_WEBHOOK, Currency, TransactionStatus
+from app.bot.payment_gateways import HttpClient, PaymentGateway
+from app.bot.utils.constants import (
+    YOOMONEY_WEBHOOK,
+    Currency,
+    PaymentEvent,
+    TransactionStatus,
+)
 from app.bot.utils.formatting import format_device_count, format_subscription_period
+from app.bot.utils.identity import BotIdentity
 from app.bot.utils.navigation import NavSubscription
 from app.config import Config
 from app.db.models import Transaction
@@ -26,6 +31,8 @@ class Yoomoney(PaymentGateway):
     name = ""
     currency = Currency.RUB
     callback = NavSubscription.PAY_YOOMONEY
+    http_timeout = 10
+    http_retries = 2
 
     def __init__(
         self,
@@ -36,6 +43,7 @@ class Yoomoney(PaymentGateway):
         bot: Bot,
         i18n: I18n,
         services: ServicesContainer,
+        http: HttpClient,
     ) -> None:
         self.name = __("payment:gateway:yoomoney")
         self.app = app
@@ -45,13 +53,13 @@ class Yoomoney(PaymentGateway):
         self.bot = bot
         self.i18n = i18n
         self.services = services
+        self.http = http
 
         self.app.router.add_post(YOOMONEY_WEBHOOK, self.webhook_handler)
         logger.info("YooMoney payment gateway initialized.")
 
     async def create_payment(self, data: SubscriptionData) -> str:
-        bot_username = (await self.bot.get_me()).username
-        redirect_url = f"https://t.me/{bot_username}"
+        redirect_url = await BotIdentity.link(self.bot)
 
         description = _("payment:invoice:description").format(
             devices=format_device_count(data.devices),
@@ -61,7 +69,7 @@ class Yoomoney(PaymentGateway):
         price = str(data.price)
         payment_id = str(uuid.uuid4())
 
-        pay_url = self.create_quickpay_url(
+        pay_url = await self.create_quickpay_url(
             receiver=self.config.yoomoney.WALLET_ID,
             quickpay_form="shop",
             targets=description,
@@ -74,12 +82,12 @@ class Yoomoney(PaymentGateway):
         async with self.session() as session:
             await Transaction.create(
                 session=session,
-                tg_id=data.user_id,
-                subscription=data.pack(),
                 payment_id=payment_id,
                 status=TransactionStatus.PENDING,
+                **self.transaction_fields(data),
             )
 
+        await self._remember_link(data=data, pay_url=pay_url, payment_id=payment_id)
         logger.info(f"Payment link created for user {data.user_id}: {pay_url}")
         return pay_url
 
@@ -99,14 +107,14 @@ class Yoomoney(PaymentGateway):
                 return Response(status=403)
 
             logger.debug("YooMoney verified successfully.")
-            await self.handle_payment_succeeded(event_data.get("label"))
+            await self.enqueue_payment(PaymentEvent.SUCCEEDED, event_data.get("label"))
             return Response(status=200)
 
         except Exception as exception:
             logger.exception(f"Error processing YooMoney webhook: {exception}")
             return Response(status=400)
 
-    def create_quickpay_url(
+    async def create_quickpay_url(
         self,
         receiver: str,
         quickpay_form: str,
@@ -133,8 +141,8 @@ class Yoomoney(PaymentGateway):
             if value is not None
         ).replace(" ", "%20")
 
-        response = requests.post(base_url + query)
-        return response.url
+        response = await self._post(base_url + query)
+        return str(response.url)
 
     def verify_notification(self, data: dict) -> bool:
         params = [
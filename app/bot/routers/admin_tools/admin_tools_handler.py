@@ -6,6 +6,7 @@ from aiogram.utils.i18n import gettext as _
 
 from app.bot.filters import IsAdmin, IsDev
 from app.bot.services import ServicesContainer
+from app.bot.utils.identity import BotIdentity
 from app.bot.utils.navigation import NavAdminTools
 from app.db.models import User
 
@@ -18,6 +19,7 @@ router = Router(name=__name__)
 @router.callback_query(F.data == NavAdminTools.MAIN, IsAdmin())
 async def callback_admin_tools(callback: CallbackQuery, user: User) -> None:
     logger.info(f"Admin {user.tg_id} opened admin tools.")
+    await BotIdentity.refresh(callback.bot)
     is_dev = await IsDev()(user_id=user.tg_id)
     await callback.message.edit_text(
         text=_("admin_tools:message:main"),
@@ -9,9 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.filters import IsAdmin
 from app.bot.models import ServicesContainer
-from app.bot.payment_gateways import GatewayFactory
 from app.bot.routers.misc.keyboard import back_keyboard
 from app.bot.utils.constants import MAIN_MESSAGE_ID_KEY, Currency
+from app.bot.utils.identity import BotIdentity
 from app.bot.utils.navigation import NavAdminTools
 from app.db.models import Invite, User
 
@@ -68,8 +68,7 @@ async def handle_invite_input(
 
     try:
         invite = await Invite.create(session=session, name=invite_name)
-        bot_username = (await message.bot.get_me()).username
-        invite_link = f"https://t.me/{bot_username}?start={invite.hash_code}"
+        invite_link = await BotIdentity.link(message.bot, start=invite.hash_code)
 
         await state.set_state(None)
 
@@ -129,7 +128,6 @@ async def callback_invite_details(
     user: User,
     session: AsyncSession,
     services: ServicesContainer,
-    gateway_factory: GatewayFactory,
 ) -> None:
     invite_id = int(callback.data.split("_")[3])
     invite = await session.get(Invite, invite_id)
@@ -143,22 +141,16 @@ async def callback_invite_details(
 
     logger.info(f"Admin {user.tg_id} is checking invite {invite.name}.")
 
-    bot_username = (await callback.bot.get_me()).username
-    invite_link = f"https://t.me/{bot_username}?start={invite.hash_code}"
+    invite_link = await BotIdentity.link(callback.bot, start=invite.hash_code)
 
     status = (
         _("invite_editor:status:active") if invite.is_active else _("invite_editor:status:inactive")
     )
 
-    payment_method_currencies = {}
-    for gateway in gateway_factory.get_gateways():
-        payment_method_currencies[gateway.callback] = gateway.currency.code
-
     try:
         stats = await services.invite_stats.get_detailed_stats(
             invite_name=invite.name,
             session=session,
-            payment_method_currencies=payment_method_currencies,
         )
     except Exception as e:
         logger.error(f"Failed to get invite stats for {invite.name}: {e}")
@@ -200,7 +192,6 @@ async def callback_toggle_invite(
     user: User,
     session: AsyncSession,
     services: ServicesContainer,
-    gateway_factory: GatewayFactory,
 ) -> None:
     invite_id = int(callback.data.split("_")[3])
     invite = await session.get(Invite, invite_id)
@@ -233,7 +224,6 @@ async def callback_toggle_invite(
         user=user,
         session=session,
         services=services,
-        gateway_factory=gateway_factory,
     )
 
 
@@ -7,6 +7,7 @@ from app.bot.routers.misc.keyboard import (
     back_to_main_menu_button,
     cancel_button,
 )
+from app.bot.utils.constants import BroadcastSegment
 from app.bot.utils.navigation import NavAdminTools
 from app.db.models import Server
 from app.db.models.invite import Invite
@@ -234,6 +235,13 @@ def notification_keyboard() -> InlineKeyboardMarkup:
         ),
     )
 
+    builder.row(
+        InlineKeyboardButton(
+            text=_("notification:button:send_to_segment"),
+            callback_data=NavAdminTools.SEND_NOTIFICATION_SEGMENT,
+        )
+    )
+
     builder.row(
         InlineKeyboardButton(
             text=_("notification:button:last_notification"),
@@ -246,6 +254,54 @@ def notification_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+def segment_title(segment: BroadcastSegment) -> str:
+    titles = {
+        BroadcastSegment.ALL: _("notification:button:send_to_all"),
+        BroadcastSegment.SERVER: _("notification:button:segment_server"),
+        BroadcastSegment.ACTIVE: _("notification:button:segment_active"),
+        BroadcastSegment.EXPIRED: _("notification:button:segment_expired"),
+        BroadcastSegment.TRIAL: _("notification:button:segment_trial"),
+        BroadcastSegment.INVITE: _("notification:button:segment_invite"),
+        BroadcastSegment.PAYERS: _("notification:button:segment_payers"),
+        BroadcastSegment.NON_PAYERS: _("notification:button:segment_non_payers"),
+    }
+    return titles[segment]
+
+
+def notification_segments_keyboard() -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+
+    for segment in BroadcastSegment:
+        if segment == BroadcastSegment.ALL:
+            continue
+
+        builder.add(
+            InlineKeyboardButton(
+                text=segment_title(segment),
+                callback_data=NavAdminTools.SELECT_NOTIFICATION_SEGMENT + f"_{segment.value}",
+            )
+        )
+
+    builder.adjust(2)
+    builder.row(back_button(NavAdminTools.NOTIFICATION))
+    return builder.as_markup()
+
+
+def notification_targets_keyboard(targets: list[tuple[int, str]]) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+
+    for target_id, name in targets:
+        builder.row(
+            InlineKeyboardButton(
+                text=name,
+                callback_data=NavAdminTools.SELECT_NOTIFICATION_TARGET + f"_{target_id}",
+            )
+        )
+
+    builder.row(back_button(NavAdminTools.SEND_NOTIFICATION_SEGMENT))
+    return builder.as_markup()
+
+
 def last_notification_keyboard() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
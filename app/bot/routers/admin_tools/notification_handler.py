@@ -9,22 +9,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.filters import IsAdmin
 from app.bot.models import ServicesContainer
-from app.bot.routers.misc.keyboard import back_keyboard, close_notification_keyboard
+from app.bot.routers.misc.keyboard import back_keyboard
 from app.bot.utils.constants import (
     MAIN_MESSAGE_ID_KEY,
+    NOTIFICATION_BROADCAST_ID_KEY,
     NOTIFICATION_CHAT_IDS_KEY,
-    NOTIFICATION_LAST_MESSAGE_IDS_KEY,
-    NOTIFICATION_MESSAGE_TEXT_KEY,
     NOTIFICATION_PRE_MESSAGE_TEXT_KEY,
+    NOTIFICATION_SEGMENT_KEY,
+    NOTIFICATION_SEGMENT_VALUE_KEY,
+    BroadcastSegment,
+    BroadcastStatus,
 )
 from app.bot.utils.navigation import NavAdminTools
 from app.bot.utils.validation import is_valid_message_text, is_valid_user_id
-from app.db.models import User
+from app.db.models import Invite, Server, User
 
 from .keyboard import (
     confirm_send_notification_keyboard,
     last_notification_keyboard,
     notification_keyboard,
+    notification_segments_keyboard,
+    notification_targets_keyboard,
+    segment_title,
 )
 
 logger = logging.getLogger(__name__)
@@ -172,8 +178,13 @@ async def callback_confirm_send_notification(
     notification = await services.notification.notify_by_id(chat_id=user_id[0], text=text)
 
     if notification:
-        await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: [notification.message_id]})
-        await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
+        broadcast = await services.broadcast.record(
+            admin_id=user.tg_id,
+            text=text,
+            message=notification,
+        )
+        broadcast_id = broadcast.id if broadcast else None
+        await state.update_data({NOTIFICATION_BROADCAST_ID_KEY: broadcast_id})
         await show_notification_main(message=callback.message, state=state)
         await services.notification.notify_by_message(
             message=callback.message,
@@ -195,6 +206,12 @@ async def callback_send_notification_all(
     state: FSMContext,
 ) -> None:
     logger.info(f"Admin {user.tg_id} opened send notification to all.")
+    await state.update_data(
+        {
+            NOTIFICATION_SEGMENT_KEY: BroadcastSegment.ALL.value,
+            NOTIFICATION_SEGMENT_VALUE_KEY: None,
+        }
+    )
     await callback.message.edit_text(
         text=_("notification:message:send_to_all"),
         reply_markup=back_keyboard(NavAdminTools.NOTIFICATION),
@@ -202,6 +219,117 @@ async def callback_send_notification_all(
     await state.set_state(NotificationStates.message_to_all)
 
 
+async def show_send_to_segment(
+    message: Message,
+    state: FSMContext,
+    segment: BroadcastSegment,
+    segment_value: str | None = None,
+) -> None:
+    await state.update_data(
+        {
+            NOTIFICATION_SEGMENT_KEY: segment.value,
+            NOTIFICATION_SEGMENT_VALUE_KEY: segment_value,
+        }
+    )
+    title = segment_title(segment)
+
+    if segment_value and segment == BroadcastSegment.INVITE:
+        title = f"{title}: {segment_value}"
+
+    await message.edit_text(
+        text=_("notification:message:send_to_segment").format(segment=title),
+        reply_markup=back_keyboard(NavAdminTools.SEND_NOTIFICATION_SEGMENT),
+    )
+    await state.set_state(NotificationStates.message_to_all)
+
+
+@router.callback_query(F.data == NavAdminTools.SEND_NOTIFICATION_SEGMENT, IsAdmin())
+async def callback_send_notification_segment(
+    callback: CallbackQuery,
+    user: User,
+    state: FSMContext,
+) -> None:
+    logger.info(f"Admin {user.tg_id} opened send notification to segment.")
+    await state.set_state(None)
+    await callback.message.edit_text(
+        text=_("notification:message:select_segment"),
+        reply_markup=notification_segments_keyboard(),
+    )
+
+
+@router.callback_query(F.data.startswith(NavAdminTools.SELECT_NOTIFICATION_SEGMENT), IsAdmin())
+async def callback_select_notification_segment(
+    callback: CallbackQuery,
+    user: User,
+    session: AsyncSession,
+    state: FSMContext,
+    services: ServicesContainer,
+) -> None:
+    value = callback.data.removeprefix(NavAdminTools.SELECT_NOTIFICATION_SEGMENT + "_")
+    segment = BroadcastSegment(value)
+    logger.info(f"Admin {user.tg_id} selected notification segment {segment.value}.")
+
+    if segment == BroadcastSegment.SERVER:
+        servers = await Server.get_all(session=session)
+        targets = [(server.id, server.name) for server in servers]
+        text = _("notification:message:select_server")
+    elif segment == BroadcastSegment.INVITE:
+        invites = await Invite.get_all(session=session)
+        targets = [(invite.id, invite.name) for invite in invites]
+        text = _("notification:message:select_invite")
+    else:
+        await show_send_to_segment(message=callback.message, state=state, segment=segment)
+        return
+
+    if not targets:
+        await services.notification.show_popup(
+            callback=callback,
+            text=_("notification:popup:no_segment_targets"),
+        )
+        return
+
+    await state.update_data({NOTIFICATION_SEGMENT_KEY: segment.value})
+    await callback.message.edit_text(
+        text=text,
+        reply_markup=notification_targets_keyboard(targets),
+    )
+
+
+@router.callback_query(F.data.startswith(NavAdminTools.SELECT_NOTIFICATION_TARGET), IsAdmin())
+async def callback_select_notification_target(
+    callback: CallbackQuery,
+    user: User,
+    session: AsyncSession,
+    state: FSMContext,
+    services: ServicesContainer,
+) -> None:
+    target_id = int(callback.data.removeprefix(NavAdminTools.SELECT_NOTIFICATION_TARGET + "_"))
+    segment = BroadcastSegment(await state.get_value(NOTIFICATION_SEGMENT_KEY))
+    logger.info(f"Admin {user.tg_id} selected notification target {segment.value} {target_id}.")
+
+    if segment == BroadcastSegment.INVITE:
+        invite = await Invite.get_by_id(session=session, invite_id=target_id)
+        segment_value = invite.name if invite else None
+    else:
+        server = await Server.get_by_id(session=session, id=target_id)
+        segment_value = str(server.id) if server else None
+
+    if segment_value is None:
+        logger.warning(f"Notification target {segment.value} {target_id} no longer exists.")
+        await services.notification.show_popup(
+            callback=callback,
+            text=_("notification:popup:no_segment_targets"),
+        )
+        return
+
+    await show_send_to_segment(
+        message=callback.message,
+        state=state,
+        segment=segment,
+        segment_value=segment_value,
+    )
+
+
 @router.message(NotificationStates.message_to_all)
 async def message_to_all(
     message: Message,
@@ -238,7 +366,6 @@ async def message_to_all(
 async def callback_confirm_send_notification_all(
     callback: CallbackQuery,
     user: User,
-    session: AsyncSession,
     state: FSMContext,
     services: ServicesContainer,
 ) -> None:
@@ -253,36 +380,30 @@ async def callback_confirm_send_notification_all(
         )
         return None
 
-    await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
-    users = await User.get_all(session=session)
-    await services.notification.notify_by_message(
-        message=callback.message,
-        text=_("notification:ntf:sending_to_all").format(
-            count=len(users),
-        ),
-        duration=5,
+    segment = BroadcastSegment(
+        await state.get_value(NOTIFICATION_SEGMENT_KEY, BroadcastSegment.ALL.value)
     )
-    user_ids = []
-    message_ids = []
-
-    for _user in users:
-        notification = await services.notification.notify_by_id(chat_id=_user.tg_id, text=text)
-
-        if notification:
-            user_ids.append(_user.tg_id)
-            message_ids.append(notification.message_id)
-
-    await state.update_data({NOTIFICATION_CHAT_IDS_KEY: user_ids})
-    await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: message_ids})
-    await show_notification_main(message=callback.message, state=state)
-    await services.notification.notify_by_message(
-        message=callback.message,
-        text=_("notification:ntf:sent_success_all").format(
-            success=len(user_ids),
-            failed=len(users) - len(user_ids),
-        ),
-        duration=5,
+    broadcast = await services.broadcast.start(
+        admin_id=user.tg_id,
+        text=text,
+        segment=segment,
+        segment_value=await state.get_value(NOTIFICATION_SEGMENT_VALUE_KEY),
     )
+    await show_notification_main(message=callback.message, state=state)
+
+    if broadcast:
+        await state.update_data({NOTIFICATION_BROADCAST_ID_KEY: broadcast.id})
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("notification:ntf:sending_to_all").format(count=broadcast.total),
+            duration=5,
+        )
+    else:
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("notification:ntf:failed_to_send_message"),
+            duration=5,
+        )
 
 
 @router.callback_query(F.data == NavAdminTools.LAST_NOTIFICATION, IsAdmin())
@@ -293,13 +414,14 @@ async def callback_last_notification(
     services: ServicesContainer,
 ) -> None:
     logger.info(f"Admin {user.tg_id} opened last notification.")
-    user_ids = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
-    message_text = await state.get_value(NOTIFICATION_MESSAGE_TEXT_KEY)
-    if user_ids and len(user_ids) > 0:
+    broadcast = await services.broadcast.get(await state.get_value(NOTIFICATION_BROADCAST_ID_KEY))
+    message_count = await services.broadcast.count_deliveries(broadcast.id) if broadcast else 0
+
+    if message_count > 0:
         await callback.message.edit_text(
             text=_("notification:message:last_notification").format(
-                message_count=len(user_ids),
-                message_text=message_text,
+                message_count=message_count,
+                message_text=broadcast.text,
             ),
             reply_markup=last_notification_keyboard(),
         )
@@ -365,9 +487,6 @@ async def callback_confirm_edit_notification(
 ) -> None:
     logger.info(f"Admin {user.tg_id} confirmed edit notification.")
     text = await state.get_value(NOTIFICATION_PRE_MESSAGE_TEXT_KEY)
-    chat_ids = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
-    last_message_ids = await state.get_value(NOTIFICATION_LAST_MESSAGE_IDS_KEY)
-    chat_ids_count = len(chat_ids)
 
     if not is_valid_message_text(text):
         await services.notification.notify_by_message(
@@ -377,70 +496,32 @@ async def callback_confirm_edit_notification(
         )
         return None
 
-    await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
+    broadcast = await services.broadcast.get(await state.get_value(NOTIFICATION_BROADCAST_ID_KEY))
+    message_count = await services.broadcast.count_deliveries(broadcast.id) if broadcast else 0
 
-    if chat_ids and last_message_ids and chat_ids_count > 0:
-        if chat_ids_count > 1:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:editing_notification").format(
-                    count=chat_ids_count,
-                ),
-                duration=5,
-            )
-        success = 0
-        edited = False
-        for chat_id, last_message_id in zip(chat_ids, last_message_ids):
-
-            try:
-                edited = await callback.message.bot.edit_message_text(
-                    text=text,
-                    chat_id=chat_id,
-                    message_id=last_message_id,
-                    reply_markup=close_notification_keyboard(),
-                )
-
-                if edited:
-                    success += 1
-            except Exception as exception:
-                logger.error(
-                    f"Error editing message {last_message_id} from chat {chat_id}: {exception}"
-                )
-                chat_ids.remove(chat_id)
-                last_message_ids.remove(last_message_id)
-
-        await state.update_data({NOTIFICATION_CHAT_IDS_KEY: chat_ids})
-        await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: last_message_ids})
+    if message_count == 0:
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("notification:ntf:no_messages_to_edit"),
+            duration=5,
+        )
+        return None
 
-        await show_notification_main(message=callback.message, state=state)
+    if broadcast.status == BroadcastStatus.RUNNING:
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("notification:ntf:broadcast_in_progress"),
+            duration=5,
+        )
+        return None
 
-        if not edited:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:edited_failed"),
-                duration=5,
-            )
-            return None
+    services.broadcast.edit(broadcast=broadcast, text=text)
+    await show_notification_main(message=callback.message, state=state)
 
-        if chat_ids_count > 1:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:edited_success_all").format(
-                    success=success,
-                    failed=chat_ids_count - success,
-                ),
-                duration=5,
-            )
-        else:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:edited_success"),
-                duration=5,
-            )
-    else:
+    if message_count > 1:
         await services.notification.notify_by_message(
             message=callback.message,
-            text=_("notification:ntf:no_messages_to_edit"),
+            text=_("notification:ntf:editing_notification").format(count=message_count),
             duration=5,
         )
 
@@ -453,58 +534,25 @@ async def callback_delete_notification(
     services: ServicesContainer,
 ) -> None:
     logger.info(f"Admin {user.tg_id} delete notification.")
-    chat_ids = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
-    last_message_ids = await state.get_value(NOTIFICATION_LAST_MESSAGE_IDS_KEY)
-    chat_ids_count = len(chat_ids)
-
-    if last_message_ids and chat_ids and chat_ids_count > 0:
-        for chat_id, last_message_id in zip(chat_ids, last_message_ids):
-            deleted = False
-            success = 0
-
-            try:
-                deleted = await callback.message.bot.delete_message(
-                    chat_id=chat_id,
-                    message_id=last_message_id,
-                )
-                if deleted:
-                    success += 1
-            except Exception as exception:
-                logger.error(
-                    f"Error deleting message {last_message_id} from chat {chat_id}: {exception}"
-                )
-
-        await state.update_data({NOTIFICATION_CHAT_IDS_KEY: None})
-        await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: None})
-        await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: None})
-        await show_notification_main(message=callback.message, state=state)
+    broadcast = await services.broadcast.get(await state.get_value(NOTIFICATION_BROADCAST_ID_KEY))
+    message_count = await services.broadcast.count_deliveries(broadcast.id) if broadcast else 0
 
-        if not deleted:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:deleted_failed"),
-                duration=5,
-            )
-            return None
-
-        if chat_ids_count > 1:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:deleted_success_all").format(
-                    success=success,
-                    failed=chat_ids_count - success,
-                ),
-                duration=5,
-            )
-        else:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:deleted_success"),
-                duration=5,
-            )
-    else:
+    if message_count == 0:
         await services.notification.notify_by_message(
             message=callback.message,
             text=_("notification:ntf:deleted_failed"),
             duration=5,
         )
+        return None
+
+    if broadcast.status == BroadcastStatus.RUNNING:
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("notification:ntf:broadcast_in_progress"),
+            duration=5,
+        )
+        return None
+
+    services.broadcast.delete(broadcast=broadcast)
+    await state.update_data({NOTIFICATION_BROADCAST_ID_KEY: None})
+    await show_notification_main(message=callback.message, state=state)
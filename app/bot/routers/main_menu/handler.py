@@ -30,8 +30,7 @@ async def process_invite_attribution(session: AsyncSession, user: User, invite_h
             logger.info(f"Invalid or inactive invite hash: {invite_hash}")
             return False
 
-        user.source_invite_name = invite.name
-        await session.commit()
+        await User.update(session=session, tg_id=user.tg_id, source_invite_name=invite.name)
 
         await Invite.increment_clicks(session=session, invite_id=invite.id)
 
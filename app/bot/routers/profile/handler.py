@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from aiogram import F, Router
@@ -9,6 +8,7 @@ from aiogram.utils.i18n import gettext as _
 from app.bot.models import ClientData
 from app.bot.services import ServicesContainer
 from app.bot.utils.constants import PREVIOUS_CALLBACK_KEY
+from app.bot.utils.deferred import DeferredActions
 from app.bot.utils.navigation import NavProfile
 from app.db.models import User
 
@@ -86,6 +86,16 @@ async def callback_show_key(
 
     for seconds in range(9, 0, -1):
         seconds_text = _("1 second", "{} seconds", seconds).format(seconds)
-        await asyncio.sleep(1)
-        await message.edit_text(text=key_text.format(key=key, seconds_text=seconds_text))
-    await message.delete()
+        DeferredActions.edit(
+            bot=message.bot,
+            chat_id=message.chat.id,
+            message_id=message.message_id,
+            text=key_text.format(key=key, seconds_text=seconds_text),
+            delay=10 - seconds,
+        )
+    DeferredActions.delete(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        message_id=message.message_id,
+        delay=10,
+    )
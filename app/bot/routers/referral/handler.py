@@ -14,6 +14,7 @@ from app.bot.utils.constants import (
     ReferrerRewardType,
 )
 from app.bot.utils.formatting import format_subscription_period
+from app.bot.utils.identity import BotIdentity
 from app.bot.utils.navigation import NavMain, NavReferral
 from app.config import Config
 from app.db.models import Referral, ReferrerReward, User
@@ -28,10 +29,8 @@ async def generate_referral_summary_text(
     session: AsyncSession,
     user: User,
     config: Config,
-    bot_username: str,
+    referral_link: str,
 ) -> str:
-    referral_link = f"https://t.me/{bot_username}?start={user.tg_id}"
-
     text = _("referral:message:user_summary")
 
     referred_trial_enabled = config.shop.REFERRED_TRIAL_ENABLED
@@ -109,7 +108,7 @@ async def callback_referral(
 ) -> None:
     logger.info(f"User {user.tg_id} opened referral page.")
 
-    bot_username = (await callback.bot.get_me()).username
+    referral_link = await BotIdentity.link(callback.bot, start=user.tg_id)
 
     await state.update_data({PREVIOUS_CALLBACK_KEY: NavReferral.MAIN})
 
@@ -118,7 +117,7 @@ async def callback_referral(
             session=session,
             user=user,
             config=config,
-            bot_username=bot_username,
+            referral_link=referral_link,
         ),
         reply_markup=referral_keyboard(),
     )
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.bot.filters.is_dev import IsDev
 from app.bot.models import ServicesContainer, SubscriptionData
 from app.bot.payment_gateways import GatewayFactory
-from app.bot.utils.constants import TransactionStatus
+from app.bot.utils.constants import PaymentEvent, TransactionStatus
 from app.bot.utils.formatting import format_subscription_period
 from app.bot.utils.navigation import NavSubscription
 from app.db.models import Transaction, User
@@ -52,7 +52,7 @@ async def callback_payment_method_selected(
         price = plan.get_price(currency=gateway.currency, duration=duration)
         callback_data.price = price
 
-        pay_url = await gateway.create_payment(callback_data)
+        pay_url = await gateway.get_payment_link(callback_data)
 
         if callback_data.is_extend:
             text = _("payment:message:order_extend")
@@ -101,13 +101,20 @@ async def successful_payment(
         )
 
     data = SubscriptionData.unpack(message.successful_payment.invoice_payload)
+    gateway = gateway_factory.get_gateway(NavSubscription.PAY_TELEGRAM_STARS)
     transaction = await Transaction.create(
         session=session,
-        tg_id=user.tg_id,
-        subscription=data.pack(),
         payment_id=message.successful_payment.telegram_payment_charge_id,
-        status=TransactionStatus.COMPLETED,
+        status=TransactionStatus.PENDING,
+        **gateway.transaction_fields(data),
     )
 
-    gateway = gateway_factory.get_gateway(NavSubscription.PAY_TELEGRAM_STARS)
-    await gateway.handle_payment_succeeded(payment_id=transaction.payment_id)
+    if not transaction:
+        return
+
+    try:
+        await gateway.enqueue_payment(PaymentEvent.SUCCEEDED, transaction.payment_id)
+    except Exception as exception:
+        # Telegram does not redeliver successful payments, so process it right away.
+        logger.error(f"Failed to queue payment {transaction.payment_id}: {exception}")
+        await gateway.handle_payment_succeeded(payment_id=transaction.payment_id)
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.bot.models import ServicesContainer
 from app.config import Config
 
+from .broadcast import BroadcastService
 from .invite_stats import InviteStatsService
 from .notification import NotificationService
 from .payment_stats import PaymentStatsService
@@ -22,11 +23,16 @@ async def initialize(
     server_pool = ServerPoolService(config=config, session=session)
     plan = PlanService()
     vpn = VPNService(config=config, session=session, server_pool_service=server_pool)
-    notification = NotificationService(config=config, bot=bot)
+    notification = NotificationService(config=config, session_factory=session, bot=bot)
     referral = ReferralService(config=config, session_factory=session, vpn_service=vpn)
     subscription = SubscriptionService(config=config, session_factory=session, vpn_service=vpn)
     payment_stats = PaymentStatsService(session_factory=session)
     invite_stats = InviteStatsService(session_factory=session, payment_stats_service=payment_stats)
+    broadcast = BroadcastService(
+        session_factory=session,
+        bot=bot,
+        server_pool_service=server_pool,
+    )
 
     return ServicesContainer(
         server_pool=server_pool,
@@ -37,4 +43,5 @@ async def initialize(
         subscription=subscription,
         payment_stats=payment_stats,
         invite_stats=invite_stats,
+        broadcast=broadcast,
     )
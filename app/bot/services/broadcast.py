@@ -0,0 +1,406 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from aiogram import Bot
+from aiogram.types import Message
+from aiogram.utils.i18n import gettext as _
+from sqlalchemy import ColumnElement, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.bot.routers.misc.keyboard import close_notification_keyboard
+from app.bot.utils.constants import (
+    BROADCAST_PROGRESS_INTERVAL,
+    BroadcastSegment,
+    BroadcastStatus,
+    OutboundPriority,
+)
+from app.bot.utils.misc import is_chat_unreachable
+from app.bot.utils.outbound import outbound_priority
+from app.bot.utils.time import get_current_timestamp
+from app.db.models import Broadcast, BroadcastDelivery, User
+
+from .server_pool import ServerPoolService
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BroadcastService:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        bot: Bot,
+        server_pool_service: ServerPoolService,
+    ) -> None:
+        self.session_factory = session_factory
+        self.bot = bot
+        self.server_pool_service = server_pool_service
+        self._tasks: dict[str, asyncio.Task] = {}
+        logger.info("Broadcast Service initialized.")
+
+    async def get(self, broadcast_id: int | None) -> Broadcast | None:
+        if not broadcast_id:
+            return None
+
+        async with self.session_factory() as session:
+            return await Broadcast.get_by_id(session=session, broadcast_id=broadcast_id)
+
+    async def count_deliveries(self, broadcast_id: int) -> int:
+        async with self.session_factory() as session:
+            return await BroadcastDelivery.count(session=session, broadcast_id=broadcast_id)
+
+    async def start(
+        self,
+        admin_id: int,
+        text: str,
+        segment: BroadcastSegment = BroadcastSegment.ALL,
+        segment_value: str | None = None,
+    ) -> Broadcast | None:
+        filters, recipients = await self._resolve_segment(segment, segment_value)
+
+        async with self.session_factory() as session:
+            total = await self._count(session, filters, recipients)
+            broadcast = await Broadcast.create(
+                session=session,
+                admin_tg_id=admin_id,
+                text=text,
+                segment=segment,
+                segment_value=segment_value,
+                total=total,
+            )
+
+        if not broadcast:
+            return None
+
+        try:
+            progress = await self.bot.send_message(
+                chat_id=admin_id,
+                text=self._progress_text(broadcast),
+            )
+            broadcast.progress_message_id = progress.message_id
+            async with self.session_factory() as session:
+                await Broadcast.update(
+                    session=session,
+                    broadcast_id=broadcast.id,
+                    progress_message_id=progress.message_id,
+                )
+        except Exception as exception:
+            logger.error(f"Failed to send progress of broadcast {broadcast.id}: {exception}")
+
+        self._spawn(f"send:{broadcast.id}", self._run(broadcast.id))
+        return broadcast
+
+    async def record(self, admin_id: int, text: str, message: Message) -> Broadcast | None:
+        async with self.session_factory() as session:
+            broadcast = await Broadcast.create(
+                session=session,
+                admin_tg_id=admin_id,
+                text=text,
+                status=BroadcastStatus.COMPLETED,
+                total=1,
+                sent=1,
+                finished_at=func.now(),
+            )
+
+            if broadcast:
+                await BroadcastDelivery.create_bulk(
+                    session=session,
+                    broadcast_id=broadcast.id,
+                    deliveries=[(message.chat.id, message.message_id)],
+                )
+
+        return broadcast
+
+    async def resume(self) -> None:
+        async with self.session_factory() as session:
+            broadcasts = await Broadcast.get_running(session=session)
+
+        for broadcast in broadcasts:
+            logger.info(f"Resuming broadcast {broadcast.id} from user {broadcast.cursor}.")
+            self._spawn(f"send:{broadcast.id}", self._run(broadcast.id))
+
+    async def _resolve_segment(
+        self,
+        segment: BroadcastSegment,
+        value: str | None,
+    ) -> tuple[list[ColumnElement[bool]], set[int] | None]:
+        """
+        Returns SQL conditions for the segment and, for subscription-based segments,
+        the set of matching Telegram IDs taken from the cached 3X-UI inbound snapshots.
+        """
+        filters = User.segment_filters(segment, value)
+
+        if segment not in (BroadcastSegment.ACTIVE, BroadcastSegment.EXPIRED):
+            return filters, None
+
+        now = get_current_timestamp()
+        expiries = await self.server_pool_service.get_client_expiries()
+        expired = {tg_id for tg_id, expiry in expiries.items() if 0 < expiry < now}
+
+        if segment == BroadcastSegment.EXPIRED:
+            return filters, expired
+        return filters, set(expiries) - expired
+
+    @staticmethod
+    async def _count(
+        session: AsyncSession,
+        filters: list[ColumnElement[bool]],
+        recipients: set[int] | None,
+    ) -> int:
+        """Counts recipients over the same filtered query that `_run` iterates."""
+        if recipients is None:
+            return await User.count(session, *filters)
+
+        total = 0
+        async for batch in User.stream(session, *filters):
+            total += sum(1 for row in batch if row.tg_id in recipients)
+        return total
+
+    def edit(self, broadcast: Broadcast, text: str) -> None:
+        self._spawn(f"edit:{broadcast.id}", self._edit(broadcast, text))
+
+    def delete(self, broadcast: Broadcast) -> None:
+        self._spawn(f"delete:{broadcast.id}", self._delete(broadcast))
+
+    def _spawn(self, key: str, coroutine: Awaitable[None]) -> None:
+        if key in self._tasks:
+            coroutine.close()
+            logger.warning(f"Broadcast task {key} is already running.")
+            return
+
+        task = asyncio.create_task(self._bulk(coroutine))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    @staticmethod
+    async def _bulk(coroutine: Awaitable[None]) -> None:
+        outbound_priority.set(OutboundPriority.BULK)
+        await coroutine
+
+    async def _run(self, broadcast_id: int) -> None:
+        async with self.session_factory() as session:
+            broadcast = await Broadcast.get_by_id(session=session, broadcast_id=broadcast_id)
+
+        if not broadcast:
+            logger.error(f"Broadcast {broadcast_id} not found.")
+            return
+
+        reported_at = time.monotonic()
+
+        try:
+            filters, recipients = await self._resolve_segment(
+                broadcast.segment,
+                broadcast.segment_value,
+            )
+
+            async with self.session_factory() as session:
+                stream = User.stream(session, *filters, after_id=broadcast.cursor)
+                async for batch in stream:
+                    rows = [
+                        row for row in batch if recipients is None or row.tg_id in recipients
+                    ]
+                    unreachable: set[int] = set()
+                    results = await asyncio.gather(
+                        *(
+                            self._send(
+                                chat_id=row.tg_id,
+                                text=broadcast.text,
+                                unreachable=unreachable,
+                            )
+                            for row in rows
+                        )
+                    )
+                    delivered = [
+                        (row.tg_id, message.message_id)
+                        for row, message in zip(rows, results)
+                        if message
+                    ]
+                    broadcast.sent += len(delivered)
+                    broadcast.failed += len(rows) - len(delivered)
+                    broadcast.cursor = batch[-1].id
+
+                    await BroadcastDelivery.create_bulk(
+                        session=session,
+                        broadcast_id=broadcast.id,
+                        deliveries=delivered,
+                    )
+                    await User.mark_blocked(session=session, tg_ids=list(unreachable))
+                    await Broadcast.update(
+                        session=session,
+                        broadcast_id=broadcast.id,
+                        cursor=broadcast.cursor,
+                        sent=broadcast.sent,
+                        failed=broadcast.failed,
+                    )
+
+                    if time.monotonic() - reported_at >= BROADCAST_PROGRESS_INTERVAL:
+                        await self._report(broadcast)
+                        reported_at = time.monotonic()
+
+            status = BroadcastStatus.COMPLETED
+        except Exception as exception:
+            logger.exception(f"Broadcast {broadcast.id} failed: {exception}")
+            status = BroadcastStatus.FAILED
+
+        async with self.session_factory() as session:
+            await Broadcast.update(
+                session=session,
+                broadcast_id=broadcast.id,
+                status=status,
+                finished_at=func.now(),
+            )
+
+        await self._report(broadcast, finished=True)
+        logger.info(
+            f"Broadcast {broadcast.id} finished with status {status.value}: "
+            f"{broadcast.sent} sent, {broadcast.failed} failed."
+        )
+
+    async def _edit(self, broadcast: Broadcast, text: str) -> None:
+        success = failed = 0
+
+        async with self.session_factory() as session:
+            async for batch in BroadcastDelivery.stream(session=session, broadcast_id=broadcast.id):
+                results = await asyncio.gather(
+                    *(
+                        self._request(
+                            chat_id=delivery.chat_id,
+                            request=lambda delivery=delivery: self.bot.edit_message_text(
+                                text=text,
+                                chat_id=delivery.chat_id,
+                                message_id=delivery.message_id,
+                                reply_markup=close_notification_keyboard(),
+                            ),
+                        )
+                        for delivery in batch
+                    )
+                )
+                lost = [delivery.id for delivery, result in zip(batch, results) if not result]
+                success += len(batch) - len(lost)
+                failed += len(lost)
+                await BroadcastDelivery.delete_bulk(session=session, ids=lost)
+
+            await Broadcast.update(session=session, broadcast_id=broadcast.id, text=text)
+
+        logger.info(f"Broadcast {broadcast.id} edited: {success} success, {failed} failed.")
+
+        if not success:
+            summary = _("notification:ntf:edited_failed")
+        elif success + failed > 1:
+            summary = _("notification:ntf:edited_success_all").format(
+                success=success,
+                failed=failed,
+            )
+        else:
+            summary = _("notification:ntf:edited_success")
+
+        await self._notify_admin(broadcast, summary)
+
+    async def _delete(self, broadcast: Broadcast) -> None:
+        success = failed = 0
+
+        async with self.session_factory() as session:
+            async for batch in BroadcastDelivery.stream(session=session, broadcast_id=broadcast.id):
+                results = await asyncio.gather(
+                    *(
+                        self._request(
+                            chat_id=delivery.chat_id,
+                            request=lambda delivery=delivery: self.bot.delete_message(
+                                chat_id=delivery.chat_id,
+                                message_id=delivery.message_id,
+                            ),
+                        )
+                        for delivery in batch
+                    )
+                )
+                deleted = sum(1 for result in results if result)
+                success += deleted
+                failed += len(batch) - deleted
+
+            await BroadcastDelivery.delete_by_broadcast(session=session, broadcast_id=broadcast.id)
+
+        logger.info(f"Broadcast {broadcast.id} deleted: {success} success, {failed} failed.")
+
+        if not success:
+            summary = _("notification:ntf:deleted_failed")
+        elif success + failed > 1:
+            summary = _("notification:ntf:deleted_success_all").format(
+                success=success,
+                failed=failed,
+            )
+        else:
+            summary = _("notification:ntf:deleted_success")
+
+        await self._notify_admin(broadcast, summary)
+
+    async def _request(
+        self,
+        chat_id: int,
+        request: Callable[[], Awaitable[T]],
+        unreachable: set[int] | None = None,
+    ) -> T | None:
+        try:
+            return await request()
+        except Exception as exception:
+            logger.debug(f"Broadcast request to {chat_id} failed: {exception}")
+            if unreachable is not None and is_chat_unreachable(exception):
+                unreachable.add(chat_id)
+            return None
+
+    async def _send(
+        self,
+        chat_id: int,
+        text: str,
+        unreachable: set[int] | None = None,
+    ) -> Message | None:
+        return await self._request(
+            chat_id=chat_id,
+            request=lambda: self.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                reply_markup=close_notification_keyboard(),
+            ),
+            unreachable=unreachable,
+        )
+
+    def _progress_text(self, broadcast: Broadcast) -> str:
+        return _("notification:message:broadcast_progress").format(
+            sent=broadcast.sent,
+            failed=broadcast.failed,
+            total=broadcast.total,
+        )
+
+    async def _report(self, broadcast: Broadcast, finished: bool = False) -> None:
+        if not broadcast.progress_message_id:
+            return
+
+        if finished:
+            text = _("notification:ntf:sent_success_all").format(
+                success=broadcast.sent,
+                failed=broadcast.failed,
+            )
+        else:
+            text = self._progress_text(broadcast)
+
+        try:
+            await self.bot.edit_message_text(
+                text=text,
+                chat_id=broadcast.admin_tg_id,
+                message_id=broadcast.progress_message_id,
+                reply_markup=close_notification_keyboard() if finished else None,
+            )
+        except Exception as exception:
+            logger.debug(f"Failed to update progress of broadcast {broadcast.id}: {exception}")
+
+    async def _notify_admin(self, broadcast: Broadcast, text: str) -> None:
+        try:
+            await self.bot.send_message(
+                chat_id=broadcast.admin_tg_id,
+                text=text,
+                reply_markup=close_notification_keyboard(),
+            )
+        except Exception as exception:
+            logger.error(f"Failed to notify admin about broadcast {broadcast.id}: {exception}")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from app.bot.services import PaymentStatsService
@@ -39,7 +39,6 @@ class InviteStatsService:
         self,
         invite_name: str,
         session: Optional[AsyncSession] = None,
-        payment_method_currencies: Optional[Dict[str, str]] = None,
     ) -> InviteStats:
         """
         Get detailed statistics for a specific invite link.
@@ -47,7 +46,6 @@ class InviteStatsService:
         Args:
             invite_name: Name of the invite link
             session: Optional existing database session
-            payment_method_currencies: Dictionary mapping payment methods to currency codes
 
         Returns:
             InviteStats object containing detailed statistics
@@ -90,15 +88,9 @@ class InviteStatsService:
             repeat_customers = set(user_id for user_id, in repeat_users_query)
 
             # Get revenue totals from payment stats service
-            all_revenue: Dict[str, float] = {}
-            for user_id in user_ids:
-                user_revenue = await self.payment_stats.get_user_payment_stats(
-                    user_id=user_id, session=s, payment_method_currencies=payment_method_currencies
-                )
-                for currency, amount in user_revenue.items():
-                    if currency not in all_revenue:
-                        all_revenue[currency] = 0
-                    all_revenue[currency] += amount
+            all_revenue = await self.payment_stats.get_invite_revenue_stats(
+                invite_name=invite_name, session=s
+            )
 
             return InviteStats(
                 revenue=all_revenue,
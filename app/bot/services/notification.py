@@ -1,5 +1,5 @@
-import asyncio
 import logging
+from typing import Awaitable, Callable
 
 from aiogram import Bot
 from aiogram.types import (
@@ -13,13 +13,17 @@ from aiogram.types import (
 )
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.i18n import lazy_gettext as __
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.bot.models.subscription_data import SubscriptionData
 from app.bot.routers.misc.keyboard import close_notification_keyboard
 from app.bot.routers.subscription.keyboard import payment_success_keyboard
 from app.bot.utils.constants import MESSAGE_EFFECT_IDS
+from app.bot.utils.deferred import DeferredActions
 from app.bot.utils.formatting import format_device_count, format_subscription_period
+from app.bot.utils.misc import is_chat_unreachable
 from app.config import Config
+from app.db.models import User
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +33,9 @@ ReplyMarkupType = (
 
 
 class NotificationService:
-    def __init__(self, config: Config, bot: Bot) -> None:
+    def __init__(self, config: Config, session_factory: async_sessionmaker, bot: Bot) -> None:
         self.config = config
+        self.session_factory = session_factory
         self.bot = bot
         logger.info("Notification Service initialized.")
 
@@ -45,6 +50,7 @@ class NotificationService:
         document: InputFile | None = None,
         bot: Bot | None = None,
         message_effect_id: str | None = None,
+        on_unreachable: Callable[[int], Awaitable[None]] | None = None,
     ) -> Message | None:
         if not (message or chat_id):
             logger.error("Failed to send notification: message or chat_id required")
@@ -69,14 +75,17 @@ class NotificationService:
             logger.debug(f"Notification sent to {chat_id}")
         except Exception as exception:
             logger.error(f"Failed to send notification: {exception}")
+            if on_unreachable and is_chat_unreachable(exception):
+                await on_unreachable(chat_id)
             return None
 
         if duration > 0:
-            await asyncio.sleep(duration)
-            try:
-                await notification.delete()
-            except Exception as exception:
-                logger.error(f"Failed to delete message {notification.message_id}: {exception}")
+            DeferredActions.delete(
+                bot=bot,
+                chat_id=chat_id,
+                message_id=notification.message_id,
+                delay=duration,
+            )
 
         return notification
 
@@ -97,8 +106,13 @@ class NotificationService:
             document=document,
             bot=self.bot,
             message_effect_id=message_effect_id,
+            on_unreachable=self._mark_blocked,
         )
 
+    async def _mark_blocked(self, chat_id: int) -> None:
+        async with self.session_factory() as session:
+            await User.mark_blocked(session=session, tg_ids=[chat_id])
+
     @staticmethod
     async def notify_by_message(
         message: Message,
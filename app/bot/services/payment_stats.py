@@ -1,12 +1,13 @@
 import logging
-from typing import Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import ColumnElement, func, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.bot.models import SubscriptionData
-from app.bot.utils.constants import TransactionStatus
-from app.db.models import Transaction
+from app.bot.utils.constants import REVENUE_CACHE_GRACE, TransactionStatus
+from app.db.models import Transaction, User
 
 logger = logging.getLogger(__name__)
 
@@ -22,129 +23,162 @@ class PaymentStatsService:
             session_factory: SQLAlchemy async session maker
         """
         self.session_factory = session_factory
+        self._closed_periods: TTLCache = TTLCache(maxsize=256, ttl=24 * 60 * 60)
         logger.debug("PaymentStatsService initialized")
 
     async def get_user_payment_stats(
         self,
         user_id: int,
         session: Optional[AsyncSession] = None,
-        payment_method_currencies: Optional[Dict[str, str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> Dict[str, float]:
         """
-        Calculate total payments by currency for a specific user using transactions table.
+        Calculate total payments by currency for a specific user.
 
         Args:
             user_id: Telegram user ID
             session: Optional existing database session
-            payment_method_currencies: Dictionary mapping payment methods to currency codes
+            start: Optional inclusive lower bound of the transaction creation time
+            end: Optional exclusive upper bound of the transaction creation time
 
         Returns:
             Dict mapping currency codes to total amounts
         """
+        return await self._revenue(
+            Transaction.tg_id == user_id,
+            session=session,
+            start=start,
+            end=end,
+        )
+
+    async def get_invite_revenue_stats(
+        self,
+        invite_name: str,
+        session: Optional[AsyncSession] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, float]:
+        """
+        Calculate total payments by currency of users who came from an invite link.
 
-        async def _get_stats(s: AsyncSession) -> Dict[str, float]:
-            # Get completed transactions for this user
-            query = await s.execute(
-                select(Transaction).where(
-                    Transaction.tg_id == user_id, Transaction.status == TransactionStatus.COMPLETED
-                )
-            )
-            transactions = query.scalars().all()
-
-            results = {}
-            for tx in transactions:
-                try:
-                    data = SubscriptionData.unpack(tx.subscription)
-                    payment_method = data.state.value
-
-                    currency = None
-                    if payment_method_currencies:
-                        for method, curr in payment_method_currencies.items():
-                            if method in payment_method:
-                                currency = curr
-                                break
-                    else:
-                        logger.warning(
-                            f"payment_method_currencies not provided for payment_method: {payment_method}"
-                        )
-                        continue
-
-                    if not currency:
-                        logger.warning(f"Unknown payment method: {payment_method}")
-                        continue
-
-                    if currency not in results:
-                        results[currency] = 0
-                    results[currency] += float(data.price)
-                except Exception as e:
-                    logger.warning(
-                        f"Could not parse subscription data: {tx.subscription}. Error: {e}"
-                    )
-
-            return results
+        Args:
+            invite_name: Name of the invite link
+            session: Optional existing database session
+            start: Optional inclusive lower bound of the transaction creation time
+            end: Optional exclusive upper bound of the transaction creation time
 
-        if session:
-            return await _get_stats(session)
-        else:
-            async with self.session_factory() as session:
-                return await _get_stats(session)
+        Returns:
+            Dict mapping currency codes to total amounts
+        """
+        invited = select(User.tg_id).where(User.source_invite_name == invite_name)
+        return await self._revenue(
+            Transaction.tg_id.in_(invited),
+            session=session,
+            start=start,
+            end=end,
+        )
 
     async def get_total_revenue_stats(
         self,
         session: Optional[AsyncSession] = None,
-        payment_method_currencies: Optional[Dict[str, str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> Dict[str, float]:
         """
         Calculate total revenue across all completed transactions by currency.
 
+        Results for periods that ended more than REVENUE_CACHE_GRACE ago are cached.
+
         Args:
             session: Optional existing database session
-            payment_method_currencies: Dictionary mapping payment methods to currency codes
+            start: Optional inclusive lower bound of the transaction creation time
+            end: Optional exclusive upper bound of the transaction creation time
 
         Returns:
             Dict mapping currency codes to total amounts
         """
+        return await self._cached(
+            ("total", start, end),
+            end,
+            lambda: self._revenue(session=session, start=start, end=end),
+        )
+
+    async def get_gateway_revenue_stats(
+        self,
+        session: Optional[AsyncSession] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Calculate total revenue across all completed transactions by gateway and currency.
+
+        Results for periods that ended more than REVENUE_CACHE_GRACE ago are cached.
+
+        Args:
+            session: Optional existing database session
+            start: Optional inclusive lower bound of the transaction creation time
+            end: Optional exclusive upper bound of the transaction creation time
+
+        Returns:
+            Dict mapping gateway callbacks to currency codes and total amounts
+        """
+        return await self._cached(
+            ("gateway", start, end),
+            end,
+            lambda: self._revenue(session=session, start=start, end=end, by_gateway=True),
+        )
 
-        async def _get_stats(s: AsyncSession) -> Dict[str, float]:
-            query = await s.execute(
-                select(Transaction).where(Transaction.status == TransactionStatus.COMPLETED)
-            )
-            transactions = query.scalars().all()
-
-            results = {}
-            for tx in transactions:
-                try:
-                    data = SubscriptionData.unpack(tx.subscription)
-                    payment_method = data.state.value
-
-                    currency = None
-                    if payment_method_currencies:
-                        for method, curr in payment_method_currencies.items():
-                            if method in payment_method:
-                                currency = curr
-                                break
-                    else:
-                        logger.warning(
-                            f"payment_method_currencies not provided for payment_method: {payment_method}"
-                        )
-                        continue
-
-                    if not currency:
-                        logger.warning(f"Unknown payment method: {payment_method}")
-                        continue
-
-                    if currency not in results:
-                        results[currency] = 0
-                    results[currency] += float(data.price)
-                except Exception as e:
-                    logger.warning(
-                        f"Could not parse subscription data: {tx.subscription}. Error: {e}"
-                    )
-
-            return results
+    async def _cached(self, key: tuple, end: Optional[datetime], compute: Any) -> Any:
+        if key in self._closed_periods:
+            return self._closed_periods[key]
+
+        result = await compute()
+
+        if end is not None:
+            if end.tzinfo is None:
+                end = end.replace(tzinfo=timezone.utc)
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=REVENUE_CACHE_GRACE)
+            if end <= cutoff:
+                self._closed_periods[key] = result
+
+        return result
+
+    async def _revenue(
+        self,
+        *filters: ColumnElement[bool],
+        session: Optional[AsyncSession] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        by_gateway: bool = False,
+    ) -> Dict[str, Any]:
+        groups = [Transaction.currency]
+        if by_gateway:
+            groups.insert(0, Transaction.gateway)
+
+        conditions = [
+            Transaction.status == TransactionStatus.COMPLETED,
+            Transaction.currency.is_not(None),
+            *filters,
+        ]
+
+        if start is not None:
+            conditions.append(Transaction.created_at >= start)
+        if end is not None:
+            conditions.append(Transaction.created_at < end)
+
+        stmt = select(*groups, func.sum(Transaction.price)).where(*conditions).group_by(*groups)
 
         if session:
-            return await _get_stats(session)
+            rows = (await session.execute(stmt)).all()
         else:
             async with self.session_factory() as session:
-                return await _get_stats(session)
+                rows = (await session.execute(stmt)).all()
+
+        if not by_gateway:
+            return {currency: float(total or 0) for currency, total in rows}
+
+        results: Dict[str, Dict[str, float]] = {}
+        for gateway, currency, total in rows:
+            results.setdefault(gateway, {})[currency] = float(total or 0)
+        return results
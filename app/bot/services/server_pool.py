@@ -1,19 +1,46 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 
-from py3xui import AsyncApi
+from py3xui import AsyncApi, Client, Inbound
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.bot.utils.constants import INBOUND_SNAPSHOT_TTL
 from app.config import Config
 from app.db.models import Server, User
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class InboundSnapshot:
+    inbound_id: int | None
+    clients: dict[str, Client]
+    updated_at: float
+
+    @property
+    def is_expired(self) -> bool:
+        return time.monotonic() - self.updated_at > INBOUND_SNAPSHOT_TTL
+
+
+@dataclass
+class ServerSyncResult:
+    name: str
+    online: bool
+    elapsed: float
+
+    def __str__(self) -> str:
+        status = "online" if self.online else "offline"
+        return f"{self.name}: {status} in {self.elapsed * 1000:.0f} ms"
+
+
 @dataclass
 class Connection:
     server: Server
     api: AsyncApi
+    snapshot: InboundSnapshot | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
 class ServerPoolService:
@@ -23,50 +50,111 @@ class ServerPoolService:
         self._servers: dict[int, Connection] = {}
         logger.info("Server Pool Service initialized.")
 
-    async def _add_server(self, server: Server) -> None:
-        if server.id not in self._servers:
-            api = AsyncApi(
-                host=server.host,
-                username=self.config.xui.USERNAME,
-                password=self.config.xui.PASSWORD,
-                token=self.config.xui.TOKEN,
-                # use_tls_verify=False,
-                logger=logging.getLogger(f"xui_{server.name}"),
-            )
+    async def _connect(
+        self,
+        server: Server,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[Connection | None, ServerSyncResult]:
+        api = AsyncApi(
+            host=server.host,
+            username=self.config.xui.USERNAME,
+            password=self.config.xui.PASSWORD,
+            token=self.config.xui.TOKEN,
+            # use_tls_verify=False,
+            logger=logging.getLogger(f"xui_{server.name}"),
+        )
+        timeout = self.config.xui.SYNC_TIMEOUT
+        connection = None
+
+        async with semaphore:
+            started_at = time.monotonic()
             try:
-                await api.login()
-                server.online = True
-                server_conn = Connection(server=server, api=api)
-                self._servers[server.id] = server_conn
+                await asyncio.wait_for(api.login(), timeout=timeout)
+                previous = self._servers.get(server.id)
+                connection = Connection(
+                    server=server,
+                    api=api,
+                    snapshot=previous.snapshot if previous else None,
+                )
                 logger.info(f"Server {server.name} ({server.host}) added to pool successfully.")
+            except asyncio.TimeoutError:
+                logger.error(f"Failed to add server {server.name} ({server.host}): timed out.")
             except Exception as exception:
-                server.online = False
                 logger.error(f"Failed to add server {server.name} ({server.host}): {exception}")
+            elapsed = time.monotonic() - started_at
 
-            async with self.session() as session:
-                await Server.update(session=session, name=server.name, online=server.online)
+        return connection, ServerSyncResult(
+            name=server.name,
+            online=connection is not None,
+            elapsed=elapsed,
+        )
 
-    def _remove_server(self, server: Server) -> None:
-        if server.id in self._servers:
-            try:
-                del self._servers[server.id]
-            except Exception as exception:
-                logger.error(f"Failed to remove server {server.name}: {exception}")
-
-    async def refresh_server(self, server: Server) -> None:
-        if server.id in self._servers:
-            self._remove_server(server)
+    async def refresh_snapshot(self, connection: Connection) -> InboundSnapshot | None:
+        server = connection.server
 
-        await self._add_server(server)
-        logger.info(f"Server {server.name} reinitialized successfully.")
-
-    async def get_inbound_id(self, api: AsyncApi) -> int | None:
         try:
-            inbounds = await api.inbound.get_list()
+            inbounds: list[Inbound] = await connection.api.inbound.get_list()
         except Exception as exception:
-            logger.error(f"Failed to fetch inbounds: {exception}")
+            logger.error(f"Failed to fetch inbounds from server {server.name}: {exception}")
+            return None
+
+        clients = {
+            client.email: client
+            for inbound in inbounds
+            for client in inbound.settings.clients or []
+        }
+        connection.snapshot = InboundSnapshot(
+            inbound_id=inbounds[0].id if inbounds else None,
+            clients=clients,
+            updated_at=time.monotonic(),
+        )
+        logger.debug(f"Inbound snapshot for server {server.name} refreshed: {len(clients)} clients.")
+        return connection.snapshot
+
+    async def refresh_snapshots(self) -> None:
+        connections = list(self._servers.values())
+        await asyncio.gather(*(self.refresh_snapshot(conn) for conn in connections))
+
+    def invalidate_snapshot(self, connection: Connection) -> None:
+        connection.snapshot = None
+        logger.debug(f"Inbound snapshot for server {connection.server.name} invalidated.")
+
+    async def get_snapshot(self, connection: Connection) -> InboundSnapshot | None:
+        if connection.snapshot and not connection.snapshot.is_expired:
+            return connection.snapshot
+
+        async with connection.lock:
+            if connection.snapshot and not connection.snapshot.is_expired:
+                return connection.snapshot
+            return await self.refresh_snapshot(connection)
+
+    async def get_inbound_client(self, connection: Connection, email: str) -> Client | None:
+        snapshot = await self.get_snapshot(connection)
+
+        if not snapshot:
+            return None
+
+        return snapshot.clients.get(email)
+
+    async def get_inbound_id(self, connection: Connection) -> int | None:
+        snapshot = await self.get_snapshot(connection)
+
+        if not snapshot:
             return None
-        return inbounds[0].id
+
+        return snapshot.inbound_id
+
+    async def get_client_expiries(self) -> dict[int, int]:
+        snapshots = await asyncio.gather(
+            *(self.get_snapshot(connection) for connection in self._servers.values())
+        )
+        return {
+            int(email): client.expiry_time
+            for snapshot in snapshots
+            if snapshot
+            for email, client in snapshot.clients.items()
+            if email.isdigit()
+        }
 
     async def get_connection(self, user: User) -> Connection | None:
         if not user.server_id:
@@ -76,64 +164,67 @@ class ServerPoolService:
         connection = self._servers.get(user.server_id)
 
         if not connection:
-            available_servers = list(self._servers.keys())
             logger.critical(
                 f"Server {user.server_id} not found in pool. "
                 f"User assigned server: {user.server_id}, "
-                f"Available servers in pool: {available_servers}"
+                f"Available servers in pool: {list(self._servers.keys())}"
             )
-
-            async with self.session() as session:
-                server = await Server.get_by_id(session=session, id=user.server_id)
-
-            if server:
-                logger.debug(f"Server {server.name} ({server.host}) found in database.")
-                # TODO: Try to add server to pool
-            else:
-                logger.error(f"Server {user.server_id} not found in database.")
-
             return None
 
-        async with self.session() as session:
-            server = await Server.get_by_id(session=session, id=user.server_id)
-
-        connection.server = server
         return connection
 
-    async def sync_servers(self) -> None:
+    async def sync_servers(self) -> list[ServerSyncResult]:
         async with self.session() as session:
             db_servers = await Server.get_all(session)
 
         if not db_servers and not self._servers:
             logger.warning("No servers found in the database.")
-            return
+            return []
 
-        db_server_map = {server.id: server for server in db_servers}
+        semaphore = asyncio.Semaphore(self.config.xui.SYNC_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._connect(server=server, semaphore=semaphore) for server in db_servers)
+        )
 
-        for server_id in list(self._servers.keys()):
-            if server_id not in db_server_map:
-                self._remove_server(self._servers[server_id].server)
+        statuses = {}
+        for server, (_, result) in zip(db_servers, results):
+            if server.online != result.online:
+                statuses[server.id] = result.online
+            server.online = result.online
 
-        for server_id, conn in list(self._servers.items()):
-            if db_server := db_server_map.get(server_id):
-                conn.server = db_server
-            await self.refresh_server(conn.server)
+        if statuses:
+            async with self.session() as session:
+                await Server.update_online_statuses(session=session, statuses=statuses)
+
+        self._servers = {conn.server.id: conn for conn, _ in results if conn}
+        report = [result for _, result in results]
 
-        for server in db_servers:
-            if server.id not in self._servers:
-                await self._add_server(server)
+        for result in report:
+            logger.debug(f"Sync report: {result}")
 
         logger.info(f"Sync complete. Currently active servers: {len(self._servers)}")
+        return report
 
     async def assign_server_to_user(self, user: User) -> None:
+        server = await self.get_available_server()
+
+        if not server:
+            logger.error(f"Failed to assign server to user {user.tg_id}: pool is empty.")
+            return
+
+        if user.server_id == server.id:
+            return
+
         async with self.session() as session:
-            server = await self.get_available_server()
-            user.server_id = server.id
             await User.update(session=session, tg_id=user.tg_id, server_id=server.id)
 
-    async def get_available_server(self) -> Server | None:
-        await self.sync_servers()
+        previous = self._servers.get(user.server_id) if user.server_id else None
+        if previous:
+            previous.server.current_clients -= 1
+        server.current_clients += 1
+        user.server_id = server.id
 
+    async def get_available_server(self) -> Server | None:
         servers_with_free_slots = [
             conn.server
             for conn in self._servers.values()
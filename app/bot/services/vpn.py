@@ -7,7 +7,7 @@ if TYPE_CHECKING:
 
 import logging
 
-from py3xui import Client, Inbound
+from py3xui import Client
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.bot.models import ClientData
@@ -56,20 +56,17 @@ class VPNService:
         if not connection:
             return None
 
-        try:
-            inbounds: list[Inbound] = await connection.api.inbound.get_list()
-        except Exception as exception:
-            logger.error(f"Failed to fetch inbounds: {exception}")
-            return None
+        inbound_client = await self.server_pool_service.get_inbound_client(
+            connection=connection,
+            email=client.email,
+        )
 
-        for inbound in inbounds:
-            for inbound_client in inbound.settings.clients:
-                if inbound_client.email == client.email:
-                    logger.debug(f"Client {client.email} limit ip: {inbound_client.limit_ip}")
-                    return inbound_client.limit_ip
+        if not inbound_client:
+            logger.critical(f"Client {client.email} not found in inbounds.")
+            return None
 
-        logger.critical(f"Client {client.email} not found in inbounds.")
-        return None
+        logger.debug(f"Client {client.email} limit ip: {inbound_client.limit_ip}")
+        return inbound_client.limit_ip
 
     async def get_client_data(self, user: User) -> ClientData | None:
         logger.debug(f"Starting to retrieve client data for {user.tg_id}.")
@@ -117,7 +114,7 @@ class VPNService:
 
     async def get_key(self, user: User) -> str | None:
         async with self.session() as session:
-            user = await User.get(session=session, tg_id=user.tg_id)
+            user = await User.get_with_relations(session=session, tg_id=user.tg_id)
 
         if not user.server_id:
             logger.debug(f"Server ID for user {user.tg_id} not found.")
@@ -160,10 +157,11 @@ class VPNService:
             sub_id=user.vpn_id,
             total_gb=total_gb,
         )
-        inbound_id = await self.server_pool_service.get_inbound_id(connection.api)
+        inbound_id = await self.server_pool_service.get_inbound_id(connection)
 
         try:
             await connection.api.client.add(inbound_id=inbound_id, clients=[new_client])
+            self.server_pool_service.invalidate_snapshot(connection)
             logger.info(f"Successfully created client for {user.tg_id}")
             return True
         except Exception as exception:
@@ -216,6 +214,7 @@ class VPNService:
             client.total_gb = total_gb
 
             await connection.api.client.update(client_uuid=client.id, client=client)
+            self.server_pool_service.invalidate_snapshot(connection)
             logger.info(f"Client {user.tg_id} updated successfully.")
             return True
         except Exception as exception:
@@ -1,2 +1,3 @@
 from .referral import start_scheduler
+from .servers import start_scheduler
 from .transactions import start_scheduler
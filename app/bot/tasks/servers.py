@@ -0,0 +1,36 @@
+import logging
+from datetime import datetime
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.bot.services import ServerPoolService
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_servers(server_pool_service: ServerPoolService) -> None:
+    await server_pool_service.sync_servers()
+    logger.info("[Background check] Servers synced.")
+
+
+async def refresh_inbound_snapshots(server_pool_service: ServerPoolService) -> None:
+    await server_pool_service.refresh_snapshots()
+    logger.info("[Background check] Inbound snapshots refreshed.")
+
+
+def start_scheduler(server_pool_service: ServerPoolService) -> None:
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        sync_servers,
+        "interval",
+        minutes=10,
+        args=[server_pool_service],
+    )
+    scheduler.add_job(
+        refresh_inbound_snapshots,
+        "interval",
+        minutes=1,
+        args=[server_pool_service],
+        next_run_time=datetime.now(),
+    )
+    scheduler.start()
@@ -22,8 +22,9 @@ SERVER_HOST_KEY = "server_host"
 SERVER_MAX_CLIENTS_KEY = "server_max_clients"
 
 NOTIFICATION_CHAT_IDS_KEY = "notification_chat_ids"
-NOTIFICATION_LAST_MESSAGE_IDS_KEY = "notification_last_message_ids"
-NOTIFICATION_MESSAGE_TEXT_KEY = "notification_message_text"
+NOTIFICATION_BROADCAST_ID_KEY = "notification_broadcast_id"
+NOTIFICATION_SEGMENT_KEY = "notification_segment"
+NOTIFICATION_SEGMENT_VALUE_KEY = "notification_segment_value"
 NOTIFICATION_PRE_MESSAGE_TEXT_KEY = "notification_pre_message_text"
 # endregion
 
@@ -52,6 +53,38 @@ I18N_DOMAIN = "bot"
 # region: Constants
 UNLIMITED = "∞"
 DB_FORMAT = "sqlite3"
+INBOUND_SNAPSHOT_TTL = 300  # Seconds before a cached 3X-UI inbound snapshot is refetched
+TELEGRAM_GLOBAL_RATE_LIMIT = 25  # Messages per second across all chats (Telegram allows ~30)
+TELEGRAM_CHAT_RATE_LIMIT = 1  # Messages per second to a single chat
+TELEGRAM_CHAT_BURST = 3  # Requests to a single chat allowed back to back
+TELEGRAM_MAX_RETRIES = 3  # Attempts per request when Telegram answers with retry_after
+BROADCAST_BATCH_SIZE = 500  # Recipients processed between checkpoints
+TRANSACTION_EXPIRY_BATCH_SIZE = 1000  # Pending transactions canceled per UPDATE
+REVENUE_CACHE_GRACE = 60 * 60  # Seconds after which a past period's revenue is final and cached
+BROADCAST_PROGRESS_INTERVAL = 5  # Seconds between progress message edits
+DEFERRED_ACTIONS_TICK = 0.5  # Seconds; deferred actions due within one tick run together
+TELEGRAM_DELETE_MESSAGES_LIMIT = 100  # Messages per deleteMessages request
+GARBAGE_DELETE_DELAY = 1  # Seconds user messages are kept before a batched deletion
+OUTBOUND_METRICS_INTERVAL = 60  # Seconds between outbound dispatcher metrics log lines
+PAYMENT_QUEUE_STREAM = "payments:queue"  # Redis stream of verified payment webhooks
+PAYMENT_QUEUE_DEAD_STREAM = "payments:dead"  # Redis stream of payment jobs that kept failing
+PAYMENT_QUEUE_DEAD_MAXLEN = 10000  # Approximate number of dead-lettered jobs kept
+PAYMENT_QUEUE_GROUP = "payments"  # Consumer group of payment workers
+PAYMENT_QUEUE_WORKERS = 4  # Concurrent payment workers per bot instance
+PAYMENT_QUEUE_MAX_ATTEMPTS = 5  # Deliveries of a payment job before it is dead-lettered
+PAYMENT_QUEUE_RETRY_DELAY = 30  # Seconds a failed payment job waits before being retried
+PAYMENT_QUEUE_DONE_TTL = 7 * 24 * 60 * 60  # Seconds a processed payment job is remembered
+YOOKASSA_MAX_WORKERS = 4  # Threads running blocking YooKassa SDK calls
+PAYMENT_HTTP_TIMEOUT = 15  # Seconds before a payment gateway HTTP request is aborted
+PAYMENT_HTTP_RETRIES = 2  # Extra attempts when a gateway is unreachable or answers 502-504
+PAYMENT_HTTP_POOL_SIZE = 100  # Open connections kept by the shared gateway HTTP client
+PAYMENT_HTTP_DNS_TTL = 300  # Seconds resolved gateway hosts are cached
+BOT_IDENTITY_TTL = 60 * 60  # Seconds the cached getMe identity is used before it is refetched
+PAYMENT_LINK_KEY = "payments:link:"  # Redis key prefix of pending payment links
+PAYMENT_LINK_TTL = 600  # Seconds a pending payment link is reused (less than transaction expiry)
+PAYMENT_PROCESSING_LEASE = 90  # Seconds before another worker may take over a paid transaction
+PAYMENT_EFFECT_KEY = "payments:effect:"  # Redis key prefix of payment side effects already run
+PAYMENT_EFFECT_TTL = 7 * 24 * 60 * 60  # Seconds a payment side effect is remembered
 LOG_ZIP_ARCHIVE_FORMAT = "zip"
 LOG_GZ_ARCHIVE_FORMAT = "gz"
 MESSAGE_EFFECT_IDS = {
@@ -71,11 +104,40 @@ from typing import Any, Optional
 
 class TransactionStatus(Enum):
     PENDING = "pending"
+    PROCESSING = "processing"
     COMPLETED = "completed"
     CANCELED = "canceled"
     REFUNDED = "refunded"
 
 
+class PaymentEvent(Enum):
+    SUCCEEDED = "succeeded"
+    CANCELED = "canceled"
+
+
+class BroadcastStatus(Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class OutboundPriority(Enum):
+    INTERACTIVE = 0
+    PAYMENT = 1
+    BULK = 2
+
+
+class BroadcastSegment(Enum):
+    ALL = "all"
+    SERVER = "server"
+    ACTIVE = "active"
+    EXPIRED = "expired"
+    TRIAL = "trial"
+    INVITE = "invite"
+    PAYERS = "payers"
+    NON_PAYERS = "non_payers"
+
+
 class Currency(Enum):
     RUB = ("RUB", "₽")
     USD = ("USD", "$")
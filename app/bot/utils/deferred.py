@@ -0,0 +1,173 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict
+from contextlib import suppress
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
+
+from app.bot.utils.constants import (
+    DEFERRED_ACTIONS_TICK,
+    TELEGRAM_DELETE_MESSAGES_LIMIT,
+    OutboundPriority,
+)
+from app.bot.utils.outbound import outbound_priority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class DeferredAction:
+    due: float
+    seq: int
+    bot: Bot = field(compare=False)
+    chat_id: int = field(compare=False)
+    message_id: int = field(compare=False)
+    text: str | None = field(default=None, compare=False)
+    reply_markup: InlineKeyboardMarkup | None = field(default=None, compare=False)
+
+
+class DeferredActions:
+    """
+    Process-wide scheduler for message deletions and edits that must happen later.
+
+    Handlers schedule the action and return immediately; a single background
+    worker sleeps until the earliest action is due. Deletions due within the
+    same tick are grouped per chat and sent through `deleteMessages`. The
+    worker runs in its own context: edits users are watching go out in the
+    interactive lane, deletions in the bulk lane.
+    """
+
+    _queue: list[DeferredAction] = []
+    _counter = itertools.count()
+    _wakeup: asyncio.Event | None = None
+    _worker: asyncio.Task | None = None
+
+    @classmethod
+    def delete(cls, bot: Bot, chat_id: int, message_id: int, delay: float) -> None:
+        cls._push(
+            DeferredAction(
+                due=time.monotonic() + delay,
+                seq=next(cls._counter),
+                bot=bot,
+                chat_id=chat_id,
+                message_id=message_id,
+            )
+        )
+
+    @classmethod
+    def edit(
+        cls,
+        bot: Bot,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        delay: float,
+        reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> None:
+        cls._push(
+            DeferredAction(
+                due=time.monotonic() + delay,
+                seq=next(cls._counter),
+                bot=bot,
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                reply_markup=reply_markup,
+            )
+        )
+
+    @classmethod
+    async def close(cls) -> None:
+        """Stops the worker and deletes every message still waiting for deletion."""
+        if cls._worker:
+            worker, cls._worker = cls._worker, None
+            worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker
+
+        pending = [action for action in cls._queue if action.text is None]
+        cls._queue.clear()
+        await cls._delete(pending)
+
+    @classmethod
+    def _push(cls, action: DeferredAction) -> None:
+        heapq.heappush(cls._queue, action)
+
+        if cls._wakeup is None:
+            cls._wakeup = asyncio.Event()
+        if cls._worker is None or cls._worker.done():
+            cls._worker = asyncio.create_task(cls._run(), context=contextvars.Context())
+
+        cls._wakeup.set()
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            cls._wakeup.clear()
+
+            if cls._queue:
+                timeout = max(0.0, cls._queue[0].due - time.monotonic())
+            else:
+                timeout = None
+
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            deadline = time.monotonic() + DEFERRED_ACTIONS_TICK
+            due = []
+            while cls._queue and cls._queue[0].due <= deadline:
+                due.append(heapq.heappop(cls._queue))
+
+            edits = [action for action in due if action.text is not None]
+            deletions = [action for action in due if action.text is None]
+
+            try:
+                await asyncio.gather(*(cls._edit(action) for action in edits))
+                await cls._delete(deletions)
+            except Exception as exception:
+                logger.error(f"Failed to run deferred actions: {exception}")
+
+    @staticmethod
+    async def _edit(action: DeferredAction) -> None:
+        token = outbound_priority.set(OutboundPriority.INTERACTIVE)
+        try:
+            await action.bot.edit_message_text(
+                text=action.text,
+                chat_id=action.chat_id,
+                message_id=action.message_id,
+                reply_markup=action.reply_markup,
+            )
+        except Exception as exception:
+            logger.debug(f"Failed to edit message {action.message_id}: {exception}")
+        finally:
+            outbound_priority.reset(token)
+
+    @staticmethod
+    async def _delete(actions: list[DeferredAction]) -> None:
+        chats: dict[tuple[Bot, int], list[int]] = defaultdict(list)
+        for action in actions:
+            chats[(action.bot, action.chat_id)].append(action.message_id)
+
+        token = outbound_priority.set(OutboundPriority.BULK)
+        try:
+            for (bot, chat_id), message_ids in chats.items():
+                for i in range(0, len(message_ids), TELEGRAM_DELETE_MESSAGES_LIMIT):
+                    chunk = message_ids[i : i + TELEGRAM_DELETE_MESSAGES_LIMIT]
+                    try:
+                        await bot.delete_messages(chat_id=chat_id, message_ids=chunk)
+                        logger.debug(f"Deleted {len(chunk)} messages in chat {chat_id}.")
+                    except Exception as exception:
+                        logger.error(
+                            f"Failed to delete messages {chunk} in {chat_id}: {exception}"
+                        )
+        finally:
+            outbound_priority.reset(token)
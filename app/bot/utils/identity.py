@@ -0,0 +1,41 @@
+import logging
+import time
+
+from aiogram import Bot
+from aiogram.types import User
+
+from app.bot.utils.constants import BOT_IDENTITY_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class BotIdentity:
+    """
+    Cached identity of the bot (getMe) used to build t.me links.
+
+    aiogram memoizes getMe on the bot for its whole lifetime. This helper
+    drops that memo after `BOT_IDENTITY_TTL` seconds or on `refresh`, so a
+    username changed in BotFather is picked up without a restart.
+    """
+
+    _fetched_at: float = 0.0
+
+    @classmethod
+    async def get(cls, bot: Bot) -> User:
+        if time.monotonic() - cls._fetched_at >= BOT_IDENTITY_TTL:
+            return await cls.refresh(bot)
+        return await bot.me()
+
+    @classmethod
+    async def refresh(cls, bot: Bot) -> User:
+        bot._me = None
+        me = await bot.me()
+        cls._fetched_at = time.monotonic()
+        logger.info(f"Bot identity refreshed: @{me.username}")
+        return me
+
+    @classmethod
+    async def link(cls, bot: Bot, start: str | int | None = None) -> str:
+        me = await cls.get(bot)
+        url = f"https://t.me/{me.username}"
+        return f"{url}?start={start}" if start is not None else url
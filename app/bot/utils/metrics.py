@@ -0,0 +1,80 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LaneMetrics:
+    depth: int = 0
+    requests: int = 0
+    retries: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.requests if self.requests else 0.0
+
+
+@dataclass
+class LatencyMetrics:
+    """Call count and latency of an external API, logged every `log_every` calls."""
+
+    name: str
+    log_every: int = 100
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def observe(self, seconds: float, failed: bool = False) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+        if self.calls % self.log_every == 0:
+            self.log()
+
+    def log(self) -> None:
+        logger.info(
+            f"{self.name}: calls {self.calls}, errors {self.errors}, "
+            f"latency avg {self.avg:.3f}s, max {self.max:.3f}s."
+        )
+
+
+class OutboundMetrics:
+    """In-process counters of the outbound Telegram dispatcher, grouped by lane."""
+
+    def __init__(self) -> None:
+        self.lanes: dict[str, LaneMetrics] = defaultdict(LaneMetrics)
+
+    def enqueued(self, lane: str) -> None:
+        self.lanes[lane].depth += 1
+
+    def dequeued(self, lane: str, waited: float) -> None:
+        metrics = self.lanes[lane]
+        metrics.depth -= 1
+        metrics.requests += 1
+        metrics.wait_total += waited
+        metrics.wait_max = max(metrics.wait_max, waited)
+
+    def retried(self, lane: str) -> None:
+        self.lanes[lane].retries += 1
+
+    def snapshot(self) -> dict[str, LaneMetrics]:
+        return {lane: LaneMetrics(**vars(metrics)) for lane, metrics in self.lanes.items()}
+
+    def log(self) -> None:
+        for lane, metrics in self.lanes.items():
+            logger.info(
+                f"Outbound lane {lane}: depth {metrics.depth}, requests {metrics.requests}, "
+                f"retries {metrics.retries}, wait avg {metrics.wait_avg:.3f}s, "
+                f"max {metrics.wait_max:.3f}s."
+            )
@@ -4,6 +4,8 @@ import string
 import uuid
 from datetime import datetime
 
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
 CHARSET = string.ascii_uppercase + string.digits
 
 
@@ -31,3 +33,10 @@ def generate_hash(text: str, length: int = 8) -> str:
     result += secrets.choice(string.ascii_lowercase)
 
     return result
+
+
+def is_chat_unreachable(exception: Exception) -> bool:
+    """Check whether a send failed because the user blocked the bot or the chat is gone."""
+    if isinstance(exception, TelegramForbiddenError):
+        return True
+    return isinstance(exception, TelegramBadRequest) and "chat not found" in exception.message
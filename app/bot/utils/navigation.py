@@ -84,6 +84,9 @@ class NavAdminTools(str, Enum):
     NOTIFICATION = "notification"
     SEND_NOTIFICATION_USER = "send_notification_user"
     SEND_NOTIFICATION_ALL = "send_notification_all"
+    SEND_NOTIFICATION_SEGMENT = "send_notification_segment"
+    SELECT_NOTIFICATION_SEGMENT = "select_notification_segment"
+    SELECT_NOTIFICATION_TARGET = "select_notification_target"
     CONFIRM_SEND_NOTIFICATION = "confirm_send_notification"
     LAST_NOTIFICATION = "last_notification"
     EDIT_NOTIFICATION = "edit_notification"
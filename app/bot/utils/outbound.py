@@ -0,0 +1,100 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+
+from app.bot.utils.constants import (
+    OUTBOUND_METRICS_INTERVAL,
+    TELEGRAM_CHAT_BURST,
+    TELEGRAM_CHAT_RATE_LIMIT,
+    TELEGRAM_GLOBAL_RATE_LIMIT,
+    TELEGRAM_MAX_RETRIES,
+    OutboundPriority,
+)
+from app.bot.utils.metrics import OutboundMetrics
+from app.bot.utils.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+outbound_priority: ContextVar[OutboundPriority] = ContextVar(
+    "outbound_priority",
+    default=OutboundPriority.INTERACTIVE,
+)
+
+
+class OutboundDispatcher(BaseRequestMiddleware):
+    """
+    Bot session middleware that schedules every outbound Bot API call.
+
+    Requests addressed to a chat pass a per-chat bucket and a shared global
+    bucket that serves lanes in priority order: interactive replies, then
+    payment confirmations, then bulk sends. The lane is taken from the
+    `outbound_priority` context variable of the calling task. A flood control
+    answer pauses only the bucket of that chat, so other chats keep flowing,
+    and the request is retried.
+    """
+
+    def __init__(self) -> None:
+        self.limiter = RateLimiter(
+            global_rate=TELEGRAM_GLOBAL_RATE_LIMIT,
+            chat_rate=TELEGRAM_CHAT_RATE_LIMIT,
+            chat_capacity=TELEGRAM_CHAT_BURST,
+        )
+        self.metrics = OutboundMetrics()
+        self.logged_at = time.monotonic()
+        logger.debug("Outbound Dispatcher initialized.")
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id: Any = getattr(method, "chat_id", None)
+
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        priority = outbound_priority.get()
+        lane = priority.name.lower()
+
+        for attempt in range(1, TELEGRAM_MAX_RETRIES + 1):
+            queued_at = time.monotonic()
+            self.metrics.enqueued(lane)
+            try:
+                await self.limiter.acquire(chat_id=chat_id, priority=priority.value)
+            finally:
+                self.metrics.dequeued(lane, time.monotonic() - queued_at)
+
+            self._log_metrics()
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as exception:
+                if attempt == TELEGRAM_MAX_RETRIES:
+                    raise
+
+                logger.warning(
+                    f"Flood limit hit on {method.__api_method__} to {chat_id}, "
+                    f"retrying in {exception.retry_after}s."
+                )
+                self.metrics.retried(lane)
+                self.limiter.pause(exception.retry_after, chat_id=chat_id)
+
+    def _log_metrics(self) -> None:
+        now = time.monotonic()
+
+        if now - self.logged_at >= OUTBOUND_METRICS_INTERVAL:
+            self.logged_at = now
+            self.metrics.log()
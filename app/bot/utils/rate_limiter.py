@@ -0,0 +1,154 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class TokenBucket:
+    """Token bucket that waits until a token is available instead of rejecting."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill(now)
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def is_idle(self, now: float) -> bool:
+        """Whether the bucket is unpaused, full and has no waiters, i.e. carries no state."""
+        if now < self.paused_until or self.lock.locked():
+            return False
+
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given time, e.g. after a 429 retry_after."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class PriorityTokenBucket(TokenBucket):
+    """Token bucket that hands out tokens to waiters with the lowest priority value first."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        super().__init__(rate=rate, capacity=capacity)
+        self.waiters: list[tuple[int, int, asyncio.Future]] = []
+        self.counter = itertools.count()
+        self.dispatcher: asyncio.Task | None = None
+
+    async def acquire(self, priority: int = 0) -> None:
+        now = time.monotonic()
+        self._refill(now)
+
+        if not self.waiters and now >= self.paused_until and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), future))
+
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.create_task(self._dispatch())
+
+        await future
+
+    async def _dispatch(self) -> None:
+        while self.waiters:
+            now = time.monotonic()
+
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+
+            self._refill(now)
+
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self.waiters)
+            if not future.done():
+                self.tokens -= 1
+                future.set_result(None)
+
+
+class RateLimiter:
+    """
+    Combines a global priority token bucket with a bucket per chat.
+
+    Chat buckets are dropped only once they are idle, so a bucket paused by a
+    long retry_after or with requests waiting on it is never replaced by a
+    fresh, full one.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_capacity: float = 1,
+        max_chats: int = 100_000,
+        sweep_interval: float = 60,
+    ) -> None:
+        self.global_bucket = PriorityTokenBucket(rate=global_rate)
+        self.chat_rate = chat_rate
+        self.chat_capacity = chat_capacity
+        self.max_chats = max_chats
+        self.sweep_interval = sweep_interval
+        self.swept_at = time.monotonic()
+        self.chats: dict[int | str, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        now = time.monotonic()
+
+        if now - self.swept_at >= self.sweep_interval or len(self.chats) >= self.max_chats:
+            self._sweep(now)
+
+        bucket = self.chats.get(chat_id)
+
+        if bucket is None:
+            bucket = TokenBucket(rate=self.chat_rate, capacity=self.chat_capacity)
+            self.chats[chat_id] = bucket
+
+        return bucket
+
+    def _sweep(self, now: float) -> None:
+        self.swept_at = now
+        idle = [chat_id for chat_id, bucket in self.chats.items() if bucket.is_idle(now)]
+
+        for chat_id in idle:
+            del self.chats[chat_id]
+
+    async def acquire(self, chat_id: int | str | None = None, priority: int = 0) -> None:
+        if chat_id is not None:
+            await self._chat_bucket(chat_id).acquire()
+        await self.global_bucket.acquire(priority)
+
+    def pause(self, seconds: float, chat_id: int | str | None = None) -> None:
+        """Pause the chat's bucket, or the global bucket for requests without a chat."""
+        if chat_id is not None:
+            self._chat_bucket(chat_id).pause(seconds)
+        else:
+            self.global_bucket.pause(seconds)
@@ -48,6 +48,12 @@ DEFAULT_REDIS_PORT = 6379
 
 DEFAULT_SUBSCRIPTION_PORT = 2096
 DEFAULT_SUBSCRIPTION_PATH = "/user/"
+DEFAULT_XUI_SYNC_CONCURRENCY = 5
+DEFAULT_XUI_SYNC_TIMEOUT = 10
+
+DEFAULT_CACHE_USER_SIZE = 10_000
+DEFAULT_CACHE_USER_TTL = 60
+DEFAULT_CACHE_USER_REDIS_ENABLED = False
 
 DEFAULT_LOG_LEVEL = "DEBUG"
 DEFAULT_LOG_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
@@ -99,6 +105,8 @@ class XUIConfig:
     TOKEN: str | None
     SUBSCRIPTION_PORT: int
     SUBSCRIPTION_PATH: str
+    SYNC_CONCURRENCY: int
+    SYNC_TIMEOUT: int
 
 
 @dataclass
@@ -151,6 +159,13 @@ class RedisConfig:
         return f"redis://{self.HOST}:{self.PORT}/{self.DB_NAME}"
 
 
+@dataclass
+class CacheConfig:
+    USER_SIZE: int
+    USER_TTL: int
+    USER_REDIS_ENABLED: bool
+
+
 @dataclass
 class LoggingConfig:
     LEVEL: str
@@ -169,6 +184,7 @@ class Config:
     yoomoney: YooMoneyConfig
     database: DatabaseConfig
     redis: RedisConfig
+    cache: CacheConfig
     logging: LoggingConfig
 
 
@@ -346,6 +362,16 @@ def load_config() -> Config:
                 "XUI_SUBSCRIPTION_PATH",
                 default=DEFAULT_SUBSCRIPTION_PATH,
             ),
+            SYNC_CONCURRENCY=env.int(
+                "XUI_SYNC_CONCURRENCY",
+                default=DEFAULT_XUI_SYNC_CONCURRENCY,
+                validate=Range(min=1, error="XUI_SYNC_CONCURRENCY must be >= 1"),
+            ),
+            SYNC_TIMEOUT=env.int(
+                "XUI_SYNC_TIMEOUT",
+                default=DEFAULT_XUI_SYNC_TIMEOUT,
+                validate=Range(min=1, error="XUI_SYNC_TIMEOUT must be >= 1"),
+            ),
         ),
         cryptomus=CryptomusConfig(
             API_KEY=env.str("CRYPTOMUS_API_KEY", default=None),
@@ -377,6 +403,22 @@ def load_config() -> Config:
             USERNAME=env.str("REDIS_USERNAME", default=None),
             PASSWORD=env.str("REDIS_PASSWORD", default=None),
         ),
+        cache=CacheConfig(
+            USER_SIZE=env.int(
+                "CACHE_USER_SIZE",
+                default=DEFAULT_CACHE_USER_SIZE,
+                validate=Range(min=0, error="CACHE_USER_SIZE must be >= 0"),
+            ),
+            USER_TTL=env.int(
+                "CACHE_USER_TTL",
+                default=DEFAULT_CACHE_USER_TTL,
+                validate=Range(min=1, error="CACHE_USER_TTL must be >= 1"),
+            ),
+            USER_REDIS_ENABLED=env.bool(
+                "CACHE_USER_REDIS_ENABLED",
+                default=DEFAULT_CACHE_USER_REDIS_ENABLED,
+            ),
+        ),
         logging=LoggingConfig(
             LEVEL=env.str("LOG_LEVEL", default=DEFAULT_LOG_LEVEL),
             FORMAT=env.str("LOG_FORMAT", default=DEFAULT_LOG_FORMAT),
@@ -0,0 +1,122 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    Two-tier cache of user identity rows keyed by Telegram ID.
+
+    Rows are stored as plain column dictionaries. Without Redis, a bounded
+    in-process TTL/LRU cache serves repeated updates from the same user. With
+    Redis, entries are kept only there, so an `invalidate` on one bot instance
+    is seen by all of them. Writers must call `invalidate` after changing a
+    user row.
+    """
+
+    KEY_PREFIX = "cache:user:"
+
+    _local: TTLCache = TTLCache(maxsize=0, ttl=1)
+    _redis: Redis | None = None
+    _ttl: int = 0
+    enabled: bool = False
+
+    @classmethod
+    def setup(cls, maxsize: int, ttl: int, redis: Redis | None = None) -> None:
+        cls._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        cls._redis = redis
+        cls._ttl = ttl
+        cls.enabled = maxsize > 0
+        logger.info(
+            f"User cache initialized (size: {maxsize}, ttl: {ttl}s, "
+            f"redis: {'on' if redis else 'off'})."
+        )
+
+    @classmethod
+    def _key(cls, tg_id: int) -> str:
+        return f"{cls.KEY_PREFIX}{tg_id}"
+
+    @staticmethod
+    def _encode(row: dict[str, Any]) -> str:
+        return json.dumps(
+            {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+        )
+
+    @staticmethod
+    def _decode(raw: str | bytes, datetime_fields: set[str]) -> dict[str, Any]:
+        row = json.loads(raw)
+        for key in datetime_fields:
+            if row.get(key):
+                row[key] = datetime.fromisoformat(row[key])
+        return row
+
+    @classmethod
+    async def get(cls, tg_id: int, datetime_fields: set[str]) -> dict[str, Any] | None:
+        if not cls.enabled:
+            return None
+
+        if not cls._redis:
+            row = cls._local.get(tg_id)
+            if row is not None:
+                logger.debug(f"User {tg_id} served from local cache.")
+                return dict(row)
+            return None
+
+        try:
+            raw = await cls._redis.get(cls._key(tg_id))
+        except Exception as exception:
+            logger.error(f"Failed to read user {tg_id} from Redis cache: {exception}")
+            return None
+
+        if raw is None:
+            return None
+
+        row = cls._decode(raw, datetime_fields)
+        logger.debug(f"User {tg_id} served from Redis cache.")
+        return dict(row)
+
+    @classmethod
+    async def set(cls, tg_id: int, row: dict[str, Any]) -> None:
+        if not cls.enabled:
+            return
+
+        if not cls._redis:
+            cls._local[tg_id] = dict(row)
+            return
+
+        try:
+            await cls._redis.set(cls._key(tg_id), cls._encode(row), ex=cls._ttl)
+        except Exception as exception:
+            logger.error(f"Failed to write user {tg_id} to Redis cache: {exception}")
+
+    @classmethod
+    async def invalidate(cls, tg_id: int) -> None:
+        cls._local.pop(tg_id, None)
+
+        if not cls._redis:
+            return
+
+        try:
+            await cls._redis.delete(cls._key(tg_id))
+        except Exception as exception:
+            logger.error(f"Failed to invalidate user {tg_id} in Redis cache: {exception}")
+
+    @classmethod
+    async def clear(cls) -> None:
+        cls._local.clear()
+
+        if not cls._redis:
+            return
+
+        try:
+            keys = [key async for key in cls._redis.scan_iter(match=f"{cls.KEY_PREFIX}*")]
+            if keys:
+                await cls._redis.delete(*keys)
+        except Exception as exception:
+            logger.error(f"Failed to clear Redis user cache: {exception}")
@@ -1,4 +1,6 @@
 from ._base import Base
+from .broadcast import Broadcast
+from .broadcast_delivery import BroadcastDelivery
 from .invite import Invite
 from .promocode import Promocode
 from .referral import Referral
@@ -0,0 +1,102 @@
+import logging
+from datetime import datetime
+from typing import Any, Self
+
+from sqlalchemy import Integer, String, Text, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Enum
+
+from app.bot.utils.constants import BroadcastSegment, BroadcastStatus
+
+from . import Base
+
+logger = logging.getLogger(__name__)
+
+
+class Broadcast(Base):
+    """
+    Represents an admin broadcast and its delivery checkpoint.
+
+    Attributes:
+        id (int): Unique primary key for the broadcast.
+        admin_tg_id (int): Telegram ID of the admin who started the broadcast.
+        progress_message_id (int | None): ID of the progress message in the admin chat.
+        text (str): Text of the broadcast message.
+        status (BroadcastStatus): Current status of the broadcast.
+        segment (BroadcastSegment): Recipients segment of the broadcast.
+        segment_value (str | None): Segment parameter (server ID or invite name).
+        cursor (int): Last processed users.id, used to resume after a restart.
+        total (int): Number of recipients when the broadcast started.
+        sent (int): Number of delivered messages.
+        failed (int): Number of failed deliveries.
+        created_at (datetime): Timestamp when the broadcast was created.
+        finished_at (datetime | None): Timestamp when the broadcast finished.
+    """
+
+    __tablename__ = "broadcasts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    admin_tg_id: Mapped[int] = mapped_column(nullable=False)
+    progress_message_id: Mapped[int | None] = mapped_column(nullable=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[BroadcastStatus] = mapped_column(
+        Enum(BroadcastStatus, values_callable=lambda obj: [e.value for e in obj]),
+        default=BroadcastStatus.RUNNING,
+        nullable=False,
+        index=True,
+    )
+    segment: Mapped[BroadcastSegment] = mapped_column(
+        Enum(BroadcastSegment, values_callable=lambda obj: [e.value for e in obj]),
+        default=BroadcastSegment.ALL,
+        nullable=False,
+    )
+    segment_value: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    cursor: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Broadcast(id={self.id}, admin_tg_id={self.admin_tg_id}, "
+            f"status='{self.status}', segment='{self.segment}', cursor={self.cursor}, "
+            f"total={self.total}, sent={self.sent}, failed={self.failed}, "
+            f"created_at={self.created_at})>"
+        )
+
+    @classmethod
+    async def get_by_id(cls, session: AsyncSession, broadcast_id: int) -> Self | None:
+        filter = [Broadcast.id == broadcast_id]
+        query = await session.execute(select(Broadcast).where(*filter))
+        return query.scalar_one_or_none()
+
+    @classmethod
+    async def get_running(cls, session: AsyncSession) -> list[Self]:
+        filter = [Broadcast.status == BroadcastStatus.RUNNING]
+        query = await session.execute(select(Broadcast).where(*filter).order_by(Broadcast.id))
+        return query.scalars().all()
+
+    @classmethod
+    async def create(cls, session: AsyncSession, **kwargs: Any) -> Self | None:
+        broadcast = Broadcast(**kwargs)
+        session.add(broadcast)
+
+        try:
+            await session.commit()
+            logger.info(f"Broadcast {broadcast.id} created.")
+            return broadcast
+        except IntegrityError as exception:
+            await session.rollback()
+            logger.error(f"Error occurred while creating broadcast: {exception}")
+            return None
+
+    @classmethod
+    async def update(cls, session: AsyncSession, broadcast_id: int, **kwargs: Any) -> None:
+        filter = [Broadcast.id == broadcast_id]
+        await session.execute(update(Broadcast).where(*filter).values(**kwargs))
+        await session.commit()
+        logger.debug(f"Broadcast {broadcast_id} updated.")
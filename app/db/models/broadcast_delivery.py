@@ -0,0 +1,107 @@
+import logging
+from typing import AsyncIterator, Self
+
+from sqlalchemy import ForeignKey, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.bot.utils.constants import BROADCAST_BATCH_SIZE
+
+from . import Base
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastDelivery(Base):
+    """
+    Represents a message delivered by a broadcast.
+
+    Attributes:
+        id (int): Unique primary key for the delivery.
+        broadcast_id (int): Foreign key referencing the broadcast.
+        chat_id (int): Telegram chat ID the message was delivered to.
+        message_id (int): Telegram ID of the delivered message.
+    """
+
+    __tablename__ = "broadcast_deliveries"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    broadcast_id: Mapped[int] = mapped_column(
+        ForeignKey("broadcasts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    chat_id: Mapped[int] = mapped_column(nullable=False)
+    message_id: Mapped[int] = mapped_column(nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<BroadcastDelivery(id={self.id}, broadcast_id={self.broadcast_id}, "
+            f"chat_id={self.chat_id}, message_id={self.message_id})>"
+        )
+
+    @classmethod
+    async def create_bulk(
+        cls,
+        session: AsyncSession,
+        broadcast_id: int,
+        deliveries: list[tuple[int, int]],
+    ) -> None:
+        if not deliveries:
+            return
+
+        await session.execute(
+            insert(BroadcastDelivery),
+            [
+                {"broadcast_id": broadcast_id, "chat_id": chat_id, "message_id": message_id}
+                for chat_id, message_id in deliveries
+            ],
+        )
+        await session.commit()
+        logger.debug(f"Stored {len(deliveries)} deliveries of broadcast {broadcast_id}.")
+
+    @classmethod
+    async def count(cls, session: AsyncSession, broadcast_id: int) -> int:
+        filter = [BroadcastDelivery.broadcast_id == broadcast_id]
+        query = await session.execute(select(func.count(BroadcastDelivery.id)).where(*filter))
+        return query.scalar_one()
+
+    @classmethod
+    async def stream(
+        cls,
+        session: AsyncSession,
+        broadcast_id: int,
+        batch_size: int = BROADCAST_BATCH_SIZE,
+    ) -> AsyncIterator[list[Self]]:
+        after_id = 0
+
+        while True:
+            query = await session.execute(
+                select(BroadcastDelivery)
+                .where(
+                    BroadcastDelivery.broadcast_id == broadcast_id,
+                    BroadcastDelivery.id > after_id,
+                )
+                .order_by(BroadcastDelivery.id)
+                .limit(batch_size)
+            )
+            deliveries = query.scalars().all()
+
+            if not deliveries:
+                return
+
+            yield deliveries
+            after_id = deliveries[-1].id
+
+    @classmethod
+    async def delete_bulk(cls, session: AsyncSession, ids: list[int]) -> None:
+        if not ids:
+            return
+
+        await session.execute(delete(BroadcastDelivery).where(BroadcastDelivery.id.in_(ids)))
+        await session.commit()
+
+    @classmethod
+    async def delete_by_broadcast(cls, session: AsyncSession, broadcast_id: int) -> None:
+        filter = [BroadcastDelivery.broadcast_id == broadcast_id]
+        await session.execute(delete(BroadcastDelivery).where(*filter))
+        await session.commit()
+        logger.debug(f"Deliveries of broadcast {broadcast_id} deleted.")
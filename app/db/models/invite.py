@@ -37,6 +37,11 @@ class Invite(Base):
             await session.rollback()
             raise
 
+    @classmethod
+    async def get_by_id(cls, session: AsyncSession, invite_id: int) -> Optional[Self]:
+        result = await session.execute(select(cls).where(cls.id == invite_id))
+        return result.scalars().first()
+
     @classmethod
     async def get_by_hash(cls, session: AsyncSession, hash_code: str) -> Optional[Self]:
         result = await session.execute(select(cls).where(cls.hash_code == hash_code))
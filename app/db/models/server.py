@@ -4,8 +4,9 @@ from typing import Any, Self
 from sqlalchemy import *
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+
+from app.db.cache import UserCache
 
 from . import Base
 from .user import User
@@ -24,6 +25,7 @@ class Server(Base):
         max_clients (int): Maximum allowed number of clients.
         location (str | None): Server location if available.
         online (bool): Indicates whether the server is online.
+        current_clients (int): Number of users assigned to the server, counted in SQL.
         users (list[User]): List of users associated with the server.
     """
 
@@ -36,16 +38,12 @@ class Server(Base):
     location: Mapped[str | None] = mapped_column(String(32), nullable=True)
     online: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     users: Mapped[list["User"]] = relationship("User", back_populates="server")  # type: ignore
-
-    @hybrid_property
-    def current_clients(self) -> int:
-        return len(self.users)
-
-    @current_clients.expression
-    def current_clients(cls) -> Select:
-        return (
-            select(func.count(User.id)).where(User.server_id == Server.id).label("current_clients")
-        )
+    current_clients: Mapped[int] = column_property(
+        select(func.count(User.id))
+        .where(User.server_id == id)
+        .correlate_except(User)
+        .scalar_subquery()
+    )
 
     def __repr__(self) -> str:
         return (
@@ -56,22 +54,18 @@ class Server(Base):
     @classmethod
     async def get_by_id(cls, session: AsyncSession, id: int) -> Self | None:
         filter = [Server.id == id]
-        query = await session.execute(
-            select(Server).options(selectinload(Server.users)).where(*filter)
-        )
+        query = await session.execute(select(Server).where(*filter))
         return query.scalar_one_or_none()
 
     @classmethod
     async def get_by_name(cls, session: AsyncSession, name: str) -> Self | None:
         filter = [Server.name == name]
-        query = await session.execute(
-            select(Server).options(selectinload(Server.users)).where(*filter)
-        )
+        query = await session.execute(select(Server).where(*filter))
         return query.scalar_one_or_none()
 
     @classmethod
     async def get_all(cls, session: AsyncSession) -> list[Self]:
-        query = await session.execute(select(Server).options(selectinload(Server.users)))
+        query = await session.execute(select(Server))
         return query.scalars().all()
 
     @classmethod
@@ -108,13 +102,26 @@ class Server(Base):
         logger.warning(f"Server {name} not found for update.")
         return None
 
+    @classmethod
+    async def update_online_statuses(cls, session: AsyncSession, statuses: dict[int, bool]) -> None:
+        await session.execute(
+            update(Server),
+            [{"id": id, "online": online} for id, online in statuses.items()],
+        )
+        await session.commit()
+        logger.debug(f"Online status updated for {len(statuses)} servers.")
+
     @classmethod
     async def delete(cls, session: AsyncSession, name: str) -> bool:
         server = await Server.get_by_name(session=session, name=name)
 
         if server:
-            await session.delete(server)
+            await session.execute(
+                update(User).where(User.server_id == server.id).values(server_id=None)
+            )
+            await session.execute(delete(Server).where(Server.id == server.id))
             await session.commit()
+            await UserCache.clear()
             logger.info(f"Server {name} deleted.")
             return True
 
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Any, Self
 
 from sqlalchemy import *
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 from sqlalchemy.types import Enum
 
-from app.bot.utils.constants import TransactionStatus
+from app.bot.utils.constants import TRANSACTION_EXPIRY_BATCH_SIZE, TransactionStatus
 
 from . import Base
 
@@ -24,22 +24,35 @@ class Transaction(Base):
         tg_id (int): Telegram user ID associated with the transaction.
         payment_id (str): Unique payment identifier for the transaction.
         subscription (str): Name of the subscription plan associated with the transaction.
+        gateway (str | None): Payment gateway callback (e.g., pay_yookassa).
+        currency (str | None): Currency code of the payment.
+        price (float | None): Paid amount in the payment currency.
+        devices (int | None): Number of devices in the purchased plan.
+        duration (int | None): Subscription duration in days.
         status (TransactionStatus): Current status of the transaction (e.g., pending, completed).
+        processing_at (datetime | None): Start of the current processing lease, if held.
         created_at (datetime): Timestamp when the transaction was created.
         updated_at (datetime): Timestamp when the transaction was last updated.
         user (User): Related user object.
     """
 
     __tablename__ = "transactions"
+    __table_args__ = (Index("ix_transactions_status_created_at", "status", "created_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    tg_id: Mapped[int] = mapped_column(ForeignKey("users.tg_id"), nullable=False)
+    tg_id: Mapped[int] = mapped_column(ForeignKey("users.tg_id"), nullable=False, index=True)
     payment_id: Mapped[str] = mapped_column(String(length=64), unique=True, nullable=False)
     subscription: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    gateway: Mapped[str | None] = mapped_column(String(length=32), nullable=True, index=True)
+    currency: Mapped[str | None] = mapped_column(String(length=3), nullable=True, index=True)
+    price: Mapped[float | None] = mapped_column(Float, nullable=True)
+    devices: Mapped[int | None] = mapped_column(nullable=True)
+    duration: Mapped[int | None] = mapped_column(nullable=True)
     status: Mapped[TransactionStatus] = mapped_column(
         Enum(TransactionStatus, values_callable=lambda obj: [e.value for e in obj]),
         nullable=False,
     )
+    processing_at: Mapped[datetime | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         default=func.now(),
@@ -104,3 +117,146 @@ class Transaction(Base):
 
         logger.warning(f"Transaction {payment_id} not found for update.")
         return None
+
+    @classmethod
+    async def transition(
+        cls,
+        session: AsyncSession,
+        payment_id: str,
+        from_status: TransactionStatus,
+        to_status: TransactionStatus,
+        **kwargs: Any,
+    ) -> Self | None:
+        """
+        Atomically moves a transaction from one status to another.
+
+        The conditional UPDATE ... RETURNING acts as a processing lock: among
+        concurrent callers only one gets the transaction back.
+
+        Args:
+            session (AsyncSession): Database session.
+            payment_id (str): Payment identifier of the transaction.
+            from_status (TransactionStatus): Status the transaction must have.
+            to_status (TransactionStatus): New status of the transaction.
+            **kwargs: Other columns to update along with the status.
+
+        Returns:
+            Transaction | None: The updated transaction, or None if it was not in from_status.
+        """
+        filter = [Transaction.payment_id == payment_id, Transaction.status == from_status]
+        query = await session.execute(
+            update(Transaction)
+            .where(*filter)
+            .values(status=to_status, **kwargs)
+            .returning(Transaction)
+        )
+        transaction = query.scalar_one_or_none()
+        await session.commit()
+
+        if transaction:
+            logger.info(f"Transaction {payment_id} moved to {to_status.value}.")
+        else:
+            logger.info(f"Transaction {payment_id} is not {from_status.value}, skipped.")
+
+        return transaction
+
+    @classmethod
+    async def claim(cls, session: AsyncSession, payment_id: str, lease: int) -> Self | None:
+        """
+        Takes the processing lease of a paid transaction.
+
+        A pending or processing transaction is moved to processing with a fresh
+        lease, unless another worker holds a lease younger than `lease` seconds.
+        A lease left behind by a crashed worker therefore expires on its own.
+
+        Args:
+            session (AsyncSession): Database session.
+            payment_id (str): Payment identifier of the transaction.
+            lease (int): Seconds a lease is held before it may be taken over.
+
+        Returns:
+            Transaction | None: The claimed transaction, or None if it is completed,
+                canceled or leased by another worker.
+        """
+        now = datetime.now(timezone.utc)
+        filter = [
+            Transaction.payment_id == payment_id,
+            or_(
+                Transaction.status == TransactionStatus.PENDING,
+                and_(
+                    Transaction.status == TransactionStatus.PROCESSING,
+                    or_(
+                        Transaction.processing_at.is_(None),
+                        Transaction.processing_at <= now - timedelta(seconds=lease),
+                    ),
+                ),
+            ),
+        ]
+        query = await session.execute(
+            update(Transaction)
+            .where(*filter)
+            .values(status=TransactionStatus.PROCESSING, processing_at=now)
+            .returning(Transaction)
+        )
+        transaction = query.scalar_one_or_none()
+        await session.commit()
+
+        if transaction:
+            logger.info(f"Transaction {payment_id} claimed for processing.")
+
+        return transaction
+
+    @classmethod
+    async def release(cls, session: AsyncSession, payment_id: str) -> None:
+        filter = [
+            Transaction.payment_id == payment_id,
+            Transaction.status == TransactionStatus.PROCESSING,
+        ]
+        await session.execute(update(Transaction).where(*filter).values(processing_at=None))
+        await session.commit()
+        logger.info(f"Transaction {payment_id} released for retry.")
+
+    @classmethod
+    async def cancel_expired(
+        cls,
+        session: AsyncSession,
+        cutoff: datetime,
+        batch_size: int = TRANSACTION_EXPIRY_BATCH_SIZE,
+    ) -> int:
+        """
+        Cancels pending transactions created before the cutoff.
+
+        Only unpaid transactions are pending: a paid one is moved to processing
+        when its webhook is queued, so it is never canceled here.
+
+        Rows are updated set-based in chunks of `batch_size`, each committed on
+        its own, so a large backlog neither loads ORM objects nor holds one long
+        write transaction.
+
+        Args:
+            session (AsyncSession): Database session.
+            cutoff (datetime): Pending transactions created at or before it expire.
+            batch_size (int): Maximum number of rows updated per statement.
+
+        Returns:
+            int: Number of canceled transactions.
+        """
+        filter = [
+            Transaction.status == TransactionStatus.PENDING,
+            Transaction.created_at <= cutoff,
+        ]
+        total = 0
+
+        while True:
+            chunk = select(Transaction.id).where(*filter).limit(batch_size).scalar_subquery()
+            result = await session.execute(
+                update(Transaction)
+                .where(Transaction.id.in_(chunk))
+                .values(status=TransactionStatus.CANCELED)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            total += result.rowcount
+
+            if result.rowcount < batch_size:
+                return total
@@ -1,15 +1,39 @@
 import logging
 from datetime import datetime
-from typing import Any, Optional, Self
+from typing import Any, AsyncIterator, Optional, Self
 
-from sqlalchemy import ForeignKey, String, func, select, update
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    ForeignKey,
+    Row,
+    String,
+    exists,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.orm import (
+    Mapped,
+    make_transient_to_detached,
+    mapped_column,
+    relationship,
+    selectinload,
+)
 
-from app.bot.utils.constants import DEFAULT_LANGUAGE
+from app.bot.utils.constants import (
+    BROADCAST_BATCH_SIZE,
+    DEFAULT_LANGUAGE,
+    BroadcastSegment,
+    TransactionStatus,
+)
+from app.db.cache import UserCache
 
 from . import Base
+from .transaction import Transaction
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +50,7 @@ class User(Base):
         first_name (str): First name of the user.
         username (str | None): Telegram username of the user.
         created_at (datetime): Timestamp when the user was created.
+        blocked_at (datetime | None): Timestamp when the bot was found blocked by the user.
         server (Server | None): Associated server object.
         transactions (list[Transaction]): List of transactions associated with the user.
         activated_promocodes (list[Promocode]): List of promocodes activated by the user.
@@ -39,7 +64,7 @@ class User(Base):
     tg_id: Mapped[int] = mapped_column(unique=True, nullable=False)
     vpn_id: Mapped[str] = mapped_column(String(36), unique=True, nullable=False)
     server_id: Mapped[int | None] = mapped_column(
-        ForeignKey("servers.id", ondelete="SET NULL"), nullable=True
+        ForeignKey("servers.id", ondelete="SET NULL"), nullable=True, index=True
     )
     first_name: Mapped[str] = mapped_column(String(length=32), nullable=False)
     username: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
@@ -49,6 +74,7 @@ class User(Base):
         default=DEFAULT_LANGUAGE,
     )
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    blocked_at: Mapped[datetime | None] = mapped_column(nullable=True, index=True)
     server: Mapped["Server | None"] = relationship("Server", back_populates="users", uselist=False)  # type: ignore
     transactions: Mapped[list["Transaction"]] = relationship("Transaction", back_populates="user")  # type: ignore
     activated_promocodes: Mapped[list["Promocode"]] = relationship(  # type: ignore
@@ -69,7 +95,9 @@ class User(Base):
         back_populates="referred",
         uselist=False,
     )
-    source_invite_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    source_invite_name: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True, index=True
+    )
 
     def __repr__(self) -> str:
         return (
@@ -79,8 +107,62 @@ class User(Base):
             f"created_at={self.created_at}, is_trial_used={self.is_trial_used})>"
         )
 
+    def to_row(self) -> dict[str, Any]:
+        return {column.key: getattr(self, column.key) for column in User.__table__.columns}
+
+    @classmethod
+    def _datetime_fields(cls) -> set[str]:
+        return {
+            column.key
+            for column in User.__table__.columns
+            if isinstance(column.type, DateTime)
+        }
+
     @classmethod
     async def get(cls, session: AsyncSession, tg_id: int) -> Self | None:
+        filter = [User.tg_id == tg_id]
+        query = await session.execute(select(User).where(*filter))
+        user = query.scalar_one_or_none()
+
+        if user:
+            logger.debug(f"User {tg_id} retrieved from the database.")
+            return user
+
+        logger.debug(f"User {tg_id} not found in the database.")
+        return None
+
+    @classmethod
+    async def get_cached(cls, session: AsyncSession, tg_id: int) -> Self | None:
+        """
+        Fetches a user identity row through the user cache.
+
+        A cache hit is rebuilt from its column values and attached to the given
+        session without a SELECT; relationships are not loaded.
+
+        Args:
+            session (AsyncSession): Database session.
+            tg_id (int): Telegram user ID.
+
+        Returns:
+            User | None: The user if found.
+        """
+        row = await UserCache.get(tg_id=tg_id, datetime_fields=cls._datetime_fields())
+
+        if row is not None:
+            user = User(**row)
+            make_transient_to_detached(user)
+            session.add(user)
+            return user
+
+        user = await User.get(session=session, tg_id=tg_id)
+
+        if user:
+            await UserCache.set(tg_id=tg_id, row=user.to_row())
+
+        return user
+
+    @classmethod
+    async def get_with_relations(cls, session: AsyncSession, tg_id: int) -> Self | None:
         filter = [User.tg_id == tg_id]
         query = await session.execute(
             select(User)
@@ -105,6 +187,94 @@ class User(Base):
         query = await session.execute(select(User).options(selectinload(User.server)))
         return query.scalars().all()
 
+    @classmethod
+    def segment_filters(
+        cls,
+        segment: BroadcastSegment,
+        value: str | None = None,
+    ) -> list[ColumnElement[bool]]:
+        """
+        Builds SQL conditions selecting the users of a broadcast segment.
+
+        Users who blocked the bot are always excluded. Subscription state
+        (active/expired) lives in the 3X-UI panels, so those segments are
+        narrowed down by the caller.
+
+        Args:
+            segment (BroadcastSegment): Recipients segment.
+            value (str | None): Server ID or invite name for parametrized segments.
+
+        Returns:
+            list[ColumnElement[bool]]: Conditions for `User.count` and `User.stream`.
+
+        Raises:
+            ValueError: If a parametrized segment has no value.
+        """
+        has_payments = exists().where(
+            Transaction.tg_id == User.tg_id,
+            Transaction.status == TransactionStatus.COMPLETED,
+        )
+
+        reachable = User.blocked_at.is_(None)
+
+        if segment in (BroadcastSegment.SERVER, BroadcastSegment.INVITE) and not value:
+            raise ValueError(f"Segment {segment.value} requires a value.")
+
+        if segment == BroadcastSegment.SERVER:
+            return [reachable, User.server_id == int(value)]
+        if segment == BroadcastSegment.INVITE:
+            return [reachable, User.source_invite_name == value]
+        if segment == BroadcastSegment.TRIAL:
+            return [reachable, User.is_trial_used.is_(True), ~has_payments]
+        if segment == BroadcastSegment.PAYERS:
+            return [reachable, has_payments]
+        if segment == BroadcastSegment.NON_PAYERS:
+            return [reachable, ~has_payments]
+        return [reachable]
+
+    @classmethod
+    async def count(cls, session: AsyncSession, *filters: ColumnElement[bool]) -> int:
+        query = await session.execute(select(func.count(User.id)).where(*filters))
+        return query.scalar_one()
+
+    @classmethod
+    async def stream(
+        cls,
+        session: AsyncSession,
+        *filters: ColumnElement[bool],
+        after_id: int = 0,
+        batch_size: int = BROADCAST_BATCH_SIZE,
+    ) -> AsyncIterator[list[Row[tuple[int, int]]]]:
+        """
+        Yields (id, tg_id) rows in batches ordered by id using keyset pagination.
+
+        Only the two columns are selected, so memory stays bounded by the batch
+        size regardless of the number of users.
+
+        Args:
+            session (AsyncSession): Database session.
+            *filters (ColumnElement[bool]): Additional conditions on the users table.
+            after_id (int): Only users with a greater id are returned.
+            batch_size (int): Number of rows per batch.
+
+        Yields:
+            list[Row]: Next batch of (id, tg_id) rows.
+        """
+        while True:
+            query = await session.execute(
+                select(User.id, User.tg_id)
+                .where(User.id > after_id, *filters)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+            rows = query.all()
+
+            if not rows:
+                return
+
+            yield rows
+            after_id = rows[-1].id
+
     @classmethod
     async def create(cls, session: AsyncSession, tg_id: int, **kwargs: Any) -> Self | None:
         user = await User.get(session=session, tg_id=tg_id)
@@ -125,6 +295,60 @@ class User(Base):
             logger.error(f"Error occurred while creating user {tg_id}: {exception}")
             return None
 
+    @classmethod
+    async def get_or_create(
+        cls, session: AsyncSession, tg_id: int, **kwargs: Any
+    ) -> tuple[Self | None, bool]:
+        """
+        Fetches a user or inserts it if missing.
+
+        The existing-user path is a single SELECT. New users are inserted with
+        ON CONFLICT DO NOTHING RETURNING, so concurrent updates from the same
+        user do not fail on the unique tg_id constraint.
+
+        Args:
+            session (AsyncSession): Database session.
+            tg_id (int): Telegram user ID.
+            **kwargs: Column values for a newly created user.
+
+        Returns:
+            tuple[User | None, bool]: The user and whether it was created.
+        """
+        user = await User.get_cached(session=session, tg_id=tg_id)
+
+        if user:
+            return user, False
+
+        dialects = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+        insert = dialects.get(session.bind.dialect.name)
+
+        if not insert:
+            user = await User.create(session=session, tg_id=tg_id, **kwargs)
+            return user, user is not None
+
+        query = await session.execute(
+            insert(User)
+            .values(tg_id=tg_id, **kwargs)
+            .on_conflict_do_nothing(index_elements=[User.tg_id])
+            .returning(User)
+        )
+        user = query.scalar_one_or_none()
+
+        try:
+            await session.commit()
+        except IntegrityError as exception:
+            await session.rollback()
+            logger.error(f"Error occurred while creating user {tg_id}: {exception}")
+            return None, False
+
+        if user:
+            await UserCache.set(tg_id=tg_id, row=user.to_row())
+            logger.debug(f"User {tg_id} created.")
+            return user, True
+
+        logger.debug(f"User {tg_id} was created concurrently.")
+        return await User.get(session=session, tg_id=tg_id), False
+
     @classmethod
     async def update(cls, session: AsyncSession, tg_id: int, **kwargs: Any) -> Self | None:
         user = await User.get(session=session, tg_id=tg_id)
@@ -133,12 +357,34 @@ class User(Base):
             filter = [User.tg_id == tg_id]
             await session.execute(update(User).where(*filter).values(**kwargs))
             await session.commit()
+            await UserCache.invalidate(tg_id)
             logger.debug(f"User {tg_id} updated.")
             return user
 
         logger.warning(f"User {tg_id} not found in the database.")
         return None
 
+    @classmethod
+    async def mark_blocked(cls, session: AsyncSession, tg_ids: list[int]) -> None:
+        """
+        Flags users whose chats are unreachable so bulk sends skip them.
+
+        Args:
+            session (AsyncSession): Database session.
+            tg_ids (list[int]): Telegram user IDs that blocked the bot.
+        """
+        if not tg_ids:
+            return
+
+        filter = [User.tg_id.in_(tg_ids), User.blocked_at.is_(None)]
+        await session.execute(update(User).where(*filter).values(blocked_at=func.now()))
+        await session.commit()
+
+        for tg_id in tg_ids:
+            await UserCache.invalidate(tg_id)
+
+        logger.info(f"Marked {len(tg_ids)} users as blocked.")
+
     @classmethod
     async def exists(cls, session: AsyncSession, tg_id: int) -> bool:
         return await User.get(session=session, tg_id=tg_id) is not None
@@ -164,5 +410,6 @@ class User(Base):
 
         await session.execute(update(User).where(User.tg_id == tg_id).values(is_trial_used=used))
         await session.commit()
+        await UserCache.invalidate(tg_id)
         logger.info(f"Trial status updated for user {tg_id}: {used}")
         return True
@@ -0,0 +1,73 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+import app.bot.routers  # noqa: F401  # resolves the payment gateways import cycle
+from app.bot.payment_gateways import Cryptomus, HttpClient, Yoomoney
+
+
+class FakeResponse:
+    status = 200
+    content_type = "application/json"
+    url = "https://gateway.test/pay"
+
+    async def json(self) -> dict:
+        return {}
+
+
+class FakeRequest:
+    async def __aenter__(self) -> FakeResponse:
+        return FakeResponse()
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+class FakeSession:
+    closed = False
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls: list[dict] = []
+
+    def request(self, method: str, url: str, **kwargs) -> FakeRequest:
+        self.calls.append(kwargs)
+
+        if len(self.calls) <= self.failures:
+            raise aiohttp.ClientConnectorError(None, OSError("unreachable"))
+
+        return FakeRequest()
+
+
+def make_gateway(gateway_class: type, session: FakeSession):
+    gateway = gateway_class.__new__(gateway_class)
+    gateway.http = HttpClient()
+    gateway.http._session = session
+    return gateway
+
+
+@pytest.mark.parametrize("gateway_class", [Cryptomus, Yoomoney])
+def test_gateway_timeout_reaches_client_timeout(gateway_class: type) -> None:
+    session = FakeSession()
+    gateway = make_gateway(gateway_class, session)
+
+    asyncio.run(gateway._post("https://gateway.test/pay"))
+
+    timeout = session.calls[0]["timeout"]
+    assert isinstance(timeout, aiohttp.ClientTimeout)
+    assert timeout.total == gateway_class.http_timeout
+
+
+def test_gateway_retries_connection_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def no_sleep(_: float) -> None:
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    session = FakeSession(failures=Yoomoney.http_retries + 1)
+    gateway = make_gateway(Yoomoney, session)
+
+    with pytest.raises(aiohttp.ClientConnectorError):
+        asyncio.run(gateway._post("https://gateway.test/pay"))
+
+    assert len(session.calls) == Yoomoney.http_retries + 1
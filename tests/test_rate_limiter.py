@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+import pytest
+
+from app.bot.utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def make_limiter() -> RateLimiter:
+    return RateLimiter(global_rate=30, chat_rate=1, chat_capacity=3, sweep_interval=60)
+
+
+def test_paused_chat_survives_sweep(clock: FakeClock) -> None:
+    limiter = make_limiter()
+    limiter.pause(120, chat_id=1)
+    bucket = limiter._chat_bucket(1)
+
+    clock.now += 61
+    limiter._chat_bucket(2)
+
+    assert limiter._chat_bucket(1) is bucket
+    assert bucket.paused_until > clock.now
+
+
+def test_chat_with_waiters_survives_sweep(clock: FakeClock) -> None:
+    async def scenario() -> None:
+        limiter = make_limiter()
+        bucket = limiter._chat_bucket(1)
+
+        async with bucket.lock:
+            clock.now += 61
+            limiter._chat_bucket(2)
+            assert limiter._chat_bucket(1) is bucket
+
+    asyncio.run(scenario())
+
+
+def test_idle_chat_is_swept(clock: FakeClock) -> None:
+    limiter = make_limiter()
+    limiter._chat_bucket(1).tokens = 0
+
+    clock.now += 61
+    limiter._chat_bucket(2)
+
+    assert 1 not in limiter.chats